@@ -6,11 +6,11 @@ ma = arx.ARX()
 
 def show_all_cfg(acfg, key):
     print(key)
-    print(" ", [acfg[i][key] for i in range(0:NUMCHAN)])
+    print(" ", *(acfg[i][key] for i in range(NUMCHAN)))
 
 def show_arr(arr, name):
     print(name)
-    print(" ", [arr[i] for i in range(0:NUMCHAN)])
+    print(" ", *arr[:NUMCHAN])
 
 try:
     # get all channel configurations for ARX board addr = 31
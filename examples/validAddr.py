@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+"""Scan the RS485 bus for ARX boards that respond.
+"""
+
+import lwautils.lwa_arx as arx
+
+MAX_ADDR = 50
+
+
+def find():
+    print("Scanning ARX addresses 1..{}...".format(MAX_ADDR - 1))
+    ma = arx.ARX()
+    online = ma.scan_boards(range(1, MAX_ADDR))
+    for id, up in online.items():
+        print("  id: {}  {}".format(id, "online" if up else "offline"))
+    print("Done")
+
+
+find()
@@ -7,24 +7,52 @@
     >>>    my_cr = cr.CmdRsp('LWA')
     >>>    my_cr.set_resonse_key('/resp/arx/2')
     >>>    resp_dict = my_cr.send('cmd/arx/2', 'echo', 'abcd')
+
+    The service owning the command key executes the command and writes its
+    response to the 'respkey' named in the command some time later, so the
+    response cannot be read back in the same etcd transaction as the command
+    put. CmdRsp therefore keeps a watch open on the response key prefix and
+    matches responses to commands by their id.
 """
 
-import sys
-import time
-import copy
+import asyncio
+import threading
 import logging
-import datetime
-import uuid
-from pathlib import Path
-from pkg_resources import Requirement, resource_filename
+import time
+import secrets
+import collections
+import functools
+import itertools
+from importlib.resources import files
 import dsautils.dsa_store as ds
 import dsautils.dsa_syslog as dsl
 import lwautils.TimeoutException as toe
 import lwautils.ServiceNoResponseException as snre
+try:
+    # C accelerated serializer if available
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+    _dumps = json.dumps
+
+
+@functools.lru_cache(maxsize=None)
+def _etcdconf() -> str:
+    """Return the path of the packaged etcd configuration file.
+    """
+    return str(files('lwautils').joinpath('conf/etcdConfig.yml'))
+
+
+def __getattr__(name: str):
+    # ETCDCONF is resolved on first use rather than on import
+    if name == 'ETCDCONF':
+        return _etcdconf()
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
 
-ETCDCONF = resource_filename(Requirement.parse("lwa-pyutils"),
-                             "lwautils/conf/etcdConfig.yml")
-sys.path.append(str(Path('..')))
 
 # 1 Millisecond
 MILLISECONDS = 0.001
@@ -33,6 +61,35 @@ MILLISECONDS = 0.001
 MIN_HASH_IDX = 10
 MAX_HASH_IDX = 15
 
+# Most timed out commands whose late responses are still cleaned up.
+MAX_ABANDONED = 1024
+
+# Process wide etcd store shared by all CmdRsp objects.
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def _get_store() -> ds.DsaStore:
+    """Return the process wide DsaStore, creating it on first use.
+
+    Note
+    ----
+    Sharing the store reuses one etcd connection for every CmdRsp object.
+    A single CmdRsp may be shared across threads since send() keeps its
+    per-command state local.
+
+    """
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ds.DsaStore(_etcdconf())
+    return _STORE
+
+
+def _set_future_result(fut: asyncio.Future, resp_d: dict):
+    if not fut.done():
+        fut.set_result(resp_d)
+
 
 class CmdRsp:
     def __init__(self, project: str = ''):
@@ -44,15 +101,25 @@ class CmdRsp:
             Project name for logs
 
         """
-        self.my_store = ds.DsaStore(ETCDCONF)
+        self.my_store = _get_store()
 
         self.log = dsl.DsaSyslogger(project, 'cmd_rsp', logging.INFO, 'CmdRsp')
         self.log.function('c-tor')
         self.log.info("Created CmdRsp object")
-        self.cmd_id = None
-        self.response_d = None
         self.response_key = None
         self.user_timeout = 500 * MILLISECONDS
+        # response key prefix -> etcd watch id
+        self._watches = {}
+        self._watch_lock = threading.Lock()
+        # cmd_id -> callable taking the response dictionary
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        # cmd_ids given up on, oldest first. See _abandon().
+        self._abandoned = collections.deque()
+        # random per object part of the command ids and a counter so ids
+        # stay unique without reading os.urandom for every command
+        self._id_token = secrets.token_hex(3)[:MAX_HASH_IDX - MIN_HASH_IDX]
+        self._id_count = itertools.count()
 
     def _gen_cmd_id(self, ) -> str:
         """Helper to generate a unuque id for command response to ensure
@@ -65,19 +132,68 @@ class CmdRsp:
 
         """
 
-        # The id is created by grabbing the current time in ISO8601 format
-        # which gives us precision and then appends random chars on it using
-        # uuid. The number of chars is specified using MIN_HASH_IDX,
-        # MAX_HASH_IDX.
-        id0 = datetime.datetime.now().isoformat()
-        id0 += '_' + str(uuid.uuid4())[MIN_HASH_IDX:MAX_HASH_IDX]
+        # The id is created by grabbing the current time in nanoseconds since
+        # the epoch which gives us precision and then appends this object's
+        # random hex chars and a command count on it. The number of random
+        # chars is specified using MIN_HASH_IDX, MAX_HASH_IDX.
+        id0 = '{}_{}{:x}'.format(time.time_ns(), self._id_token,
+                                 next(self._id_count))
 
         return id0
 
-    def _mon_prefix_callback(self, event: list):
+    def _build_cmd(self, cmd: str, cmd_id: str, resp_key: str,
+                   val: any = '', serialize_val: bool = False) -> dict:
+        """Helper to build the command dictionary sent to a service.
+
+        Args
+        ----
+        cmd
+            A command understood by receiving object
+        cmd_id
+            Unique command id
+        resp_key
+            Key the service writes its response to
+        val
+            Optional args for command.
+        serialize_val
+            True to send val as a JSON string in {'val': <json>}.
+
+        Returns
+        -------
+        dict
+           cmd_d = {'cmd': <cmd>, 'id': <cmd_id>, 'respkey': <resp_key>,
+                    'val': <val>}
+
+        """
+        cmd_dict = {'cmd': cmd, 'id': cmd_id, 'respkey': resp_key}
+        val_dict = {}
+        if serialize_val:
+            val_dict['val'] = _dumps(val)
+        elif isinstance(val, dict):
+            # put_dict serializes immediately so a shallow copy is enough to
+            # keep the caller's dictionary untouched.
+            val_dict = dict(val)
+        else:
+            val_dict['val'] = str(val)
+        cmd_dict['val'] = val_dict
+        return cmd_dict
+
+    def _dispatch_callback(self, event: list):
         """Handles callbacks for command responses
 
-        The monitor packet must contain the cmd_id.
+        The response packet must contain the cmd_id. Responses for commands
+        this object is not waiting on are ignored.
+
+        Note
+        ----
+        The persistent watch sees every put and delete under its prefix,
+        including other processes' traffic and the delete that follows each
+        response. dsautils passes a delete on with a value that is not a
+        dictionary. Events are matched on the cmd_id at the end of the key
+        first, so only the value of a key this object waits on is looked
+        at, and it is used only if it is a dictionary carrying that cmd_id.
+        Anything else is ignored. This runs in the watch thread and must
+        not raise.
 
         Args
         ----
@@ -85,16 +201,135 @@ class CmdRsp:
             list containing the etcd_key and dictionary containing response data
 
         """
-        #print('callback: key: {}'.format(event[0]))
-        #print('callback: rsp: {}'.format(event[1]))
-        if event[0] == self.full_response_key:
-            # now look to see if cmd_id matches
-            if event[1]['id'] == self.cmd_id:
-                self.response_d = event[1]
+        try:
+            key, resp_d = event[0], event[1]
+        except (TypeError, IndexError, KeyError):
+            return
+        if not isinstance(key, str):
+            return
+        # response keys are <resp_key>-<cmd_id> and cmd_ids have no '-'
+        cmd_id = key.rpartition('-')[2]
+        with self._pending_lock:
+            resolve = self._pending.get(cmd_id)
+        if (resolve is None or not isinstance(resp_d, dict)
+                or resp_d.get('id') != cmd_id):
+            return
+        resolve(resp_d)
+
+    def _ensure_watch(self, resp_key: str):
+        """Helper to register the persistent watch covering resp_key.
+
+        Args
+        ----
+        resp_key
+            The response key prefix to watch
+
+        """
+        with self._watch_lock:
+            for prefix in self._watches:
+                if resp_key.startswith(prefix):
+                    return
+            self._watches[resp_key] = self.my_store.add_watch_prefix(
+                resp_key, self._dispatch_callback)
+
+    def _add_pending(self, cmd_id: str, resolve: callable = None) -> dict:
+        """Helper to register a command waiting on its response.
+
+        Args
+        ----
+        cmd_id
+            Unique command id
+        resolve
+            Optional callable taking the response dictionary. If None, a
+            dictionary is filled in and an event set instead.
+
+        Returns
+        -------
+        dict
+           {'event': threading.Event, 'd': None}. 'd' is filled in and the
+           event set when the response arrives. Unused if resolve is given.
+
+        """
+        pending = {'event': threading.Event(), 'd': None}
+        if resolve is None:
+            def resolve(resp_d: dict):
+                pending['d'] = resp_d
+                pending['event'].set()
+        with self._pending_lock:
+            self._pending[cmd_id] = resolve
+        return pending
+
+    def _remove_pending(self, cmd_id: str):
+        with self._pending_lock:
+            self._pending.pop(cmd_id, None)
+
+    def _read_response(self, resp_key: str, cmd_id: str) -> dict:
+        """Helper to read a response directly once the wait timed out.
+
+        Note
+        ----
+        A response written just before the deadline may still be queued in
+        the watch thread. Reading the key costs one round trip, and only
+        on the timeout path.
+
+        Args
+        ----
+        resp_key
+            Full response key of the command
+        cmd_id
+            Unique command id
+
+        Returns
+        -------
+        dict
+           The response dictionary, or None if there is none yet.
+
+        """
+        try:
+            resp_d = self.my_store.get_dict(resp_key)
+        except Exception:
+            return None
+        if isinstance(resp_d, dict) and resp_d.get('id') == cmd_id:
+            return resp_d
+        return None
+
+    def _abandon(self, cmd_id: str, resp_key: str):
+        """Helper to stop waiting on a command but still clean up after it.
+
+        Note
+        ----
+        The service writes a unique response key for every command. If the
+        response arrives after the caller gave up, nobody deletes it and the
+        key stays in etcd forever. The command is left registered with a
+        resolver that deletes the key once the response shows up. Only the
+        newest MAX_ABANDONED commands are tracked.
+
+        Args
+        ----
+        cmd_id
+            Unique command id
+        resp_key
+            Full response key of the command
+
+        """
+        def cleanup(resp_d: dict):
+            self._remove_pending(cmd_id)
+            self.my_store.delete(resp_key)
+
+        with self._pending_lock:
+            self._pending[cmd_id] = cleanup
+            self._abandoned.append(cmd_id)
+            if len(self._abandoned) > MAX_ABANDONED:
+                self._pending.pop(self._abandoned.popleft(), None)
 
     def set_response_key(self, resp_key):
         """Set the response key for the command.
 
+        Note
+        ----
+        A watch on the response key prefix is registered once and kept open
+        for later commands. Responses are matched to commands by cmd_id.
+
         Args
         ----
         resp_key
@@ -102,12 +337,45 @@ class CmdRsp:
 
         """
         self.response_key = resp_key
+        self._ensure_watch(resp_key)
+
+    def watch_prefix(self, prefix: str):
+        """Register the persistent watch for a response key prefix up front.
+
+        Note
+        ----
+        Response keys under prefix given later to set_response_key() or
+        send() reuse this watch instead of opening one of their own.
+
+        Args
+        ----
+        prefix
+            The response key prefix to watch
+
+        """
+        self._ensure_watch(prefix)
+
+    def close(self):
+        """Cancel all watches held by this object.
+        """
+        with self._watch_lock:
+            for watch_id in self._watches.values():
+                self.my_store.cancel(watch_id)
+            self._watches = {}
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def send(self,
              key: str,
              cmd: str,
              val: any = '',
-             timeout: int = 500 * MILLISECONDS) -> list:
+             timeout: int = 500 * MILLISECONDS,
+             serialize_val: bool = False,
+             resp_key: str = None) -> list:
         """Send command and payload to etcd.
 
         Note
@@ -129,6 +397,13 @@ class CmdRsp:
             Optional args for command.
         timeout
             Optional user timeoute for command. Defaults to 500ms
+        serialize_val
+            Optional. True to send val serialized as a JSON string in
+            {'val': <json>} rather than as a nested dictionary.
+        resp_key
+            Optional response key for this command only. Defaults to the
+            key given to set_response_key(). Threads sharing this object
+            should pass it rather than calling set_response_key().
      
         Returns
         -------
@@ -136,44 +411,228 @@ class CmdRsp:
            contains the response key and response dictionary.
 
         """
-        self.cmd_id = self._gen_cmd_id()
-        self.full_response_key = self.response_key + '-' + self.cmd_id
-        self.response_d = None
-        cmd_dict = {}
-        cmd_dict['cmd'] = cmd
-        cmd_dict['id'] = self.cmd_id
-        cmd_dict['respkey'] = self.full_response_key
-        val_dict = {}
-        if isinstance(val, dict):
-            val_dict = copy.deepcopy(val)
-        else:
-            val_dict['val'] = str(val)
-        cmd_dict['val'] = val_dict
+        if resp_key is None:
+            resp_key = self.response_key
+        self._ensure_watch(resp_key)
+
+        # All per-command state is local so concurrent sends on one object
+        # do not interfere with each other.
+        cmd_id = self._gen_cmd_id()
+        full_response_key = resp_key + '-' + cmd_id
+        cmd_dict = self._build_cmd(cmd, cmd_id, full_response_key, val,
+                                   serialize_val)
+
+        # The user timeout is a hard deadline that includes the put.
+        deadline = time.monotonic() + timeout
+        pending = self._add_pending(cmd_id)
+        try:
+            self.my_store.put_dict(key, cmd_dict)
+            # Block until the watch callback sets the event. The wait wakes as
+            # soon as the response arrives, there is no sleep/poll interval.
+            pending['event'].wait(timeout=max(0, deadline - time.monotonic()))
+            if pending['d'] is None and cmd != 'rset':
+                pending['d'] = self._read_response(full_response_key, cmd_id)
+        finally:
+            if pending['d'] is None:
+                self._abandon(cmd_id, full_response_key)
+            else:
+                self._remove_pending(cmd_id)
+
+        response_d = pending['d']
+        if response_d is None:
+            if cmd != 'rset':
+                raise snre.ServiceNoResponseException()
+            return response_d
+        self.my_store.delete(full_response_key)
+        return response_d
+
+    def send_nowait(self,
+                    key: str,
+                    cmd: str,
+                    val: any = '',
+                    serialize_val: bool = False,
+                    resp_key: str = None) -> str:
+        """Send command and payload to etcd without waiting for a response.
+
+        Note
+        ----
+        No watch or wait is involved, so the caller gets no error reporting
+        from the service. Use only for commands whose response would be
+        discarded anyway. The response key is deleted when it arrives.
+
+        Args
+        ----
+        key
+           Etcd key
+        cmd
+            A command understood by receiving object
+        val
+            Optional args for command.
+        serialize_val
+            Optional. See send().
+        resp_key
+            Optional response key for this command only. See send().
 
-        watch_id = self.my_store.add_watch_prefix(self.full_response_key,
-                                                  self._mon_prefix_callback)
+        Returns
+        -------
+        str
+           The command id.
+
+        """
+        if resp_key is None:
+            resp_key = self.response_key
+        self._ensure_watch(resp_key)
+
+        cmd_id = self._gen_cmd_id()
+        full_response_key = resp_key + '-' + cmd_id
+        cmd_dict = self._build_cmd(cmd, cmd_id, full_response_key, val,
+                                   serialize_val)
+        # nobody waits on the response, just delete it when it arrives
+        self._abandon(cmd_id, full_response_key)
         self.my_store.put_dict(key, cmd_dict)
+        return cmd_id
+
+    async def send_async(self,
+                         key: str,
+                         cmd: str,
+                         val: any = '',
+                         timeout: int = 500 * MILLISECONDS,
+                         serialize_val: bool = False,
+                         resp_key: str = None) -> dict:
+        """Coroutine version of send().
+
+        Note
+        ----
+        The response is delivered to an asyncio future by the persistent
+        watch, so many commands can be awaited concurrently from one thread,
+        e.g. with asyncio.gather(). The blocking etcd calls run in the
+        loop's default executor.
 
-        # now wait for dictionary to get populated by callback
-        user_timeout_count = 0
-        user_timeout_count_max = timeout / (10 * MILLISECONDS)
-        while self.response_d is None and user_timeout_count < user_timeout_count_max:
-            time.sleep(10 * MILLISECONDS)
-            user_timeout_count += 1
-
-        self.my_store.cancel(watch_id)
-
-        if cmd != 'rset' and self.response_d is None:
-            # get data via Get
-            try:
-                self.response_d = self.my_store.get_dict(self.full_response_key)
-                if self.response_d is None:
-                    raise snre.ServiceNoResponseException()
-                self.my_store.delete(self.full_response_key)
-                return self.response_d
-            except:
-                # Oops, no response from service and user_timeout reached
+        Args
+        ----
+        key
+           Etcd key
+        cmd
+            A command understood by receiving object
+        val
+            Optional args for command.
+        timeout
+            Optional user timeoute for command. Defaults to 500ms
+        serialize_val
+            Optional. See send().
+        resp_key
+            Optional. See send().
+
+        Returns
+        -------
+        dict
+           response dictionary.
+
+        Raises
+        ------
+        ServiceNoResponseException
+           No response within timeout.
+
+        """
+        if resp_key is None:
+            resp_key = self.response_key
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._ensure_watch, resp_key)
+
+        cmd_id = self._gen_cmd_id()
+        full_response_key = resp_key + '-' + cmd_id
+        cmd_dict = self._build_cmd(cmd, cmd_id, full_response_key, val,
+                                   serialize_val)
+
+        fut = loop.create_future()
+
+        def resolve(resp_d: dict):
+            # called from the watch thread
+            loop.call_soon_threadsafe(_set_future_result, fut, resp_d)
+
+        self._add_pending(cmd_id, resolve)
+        response_d = None
+        try:
+            await loop.run_in_executor(None, self.my_store.put_dict, key,
+                                       cmd_dict)
+            response_d = await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            if cmd != 'rset':
+                response_d = await loop.run_in_executor(
+                    None, self._read_response, full_response_key, cmd_id)
+        finally:
+            if response_d is None:
+                self._abandon(cmd_id, full_response_key)
+            else:
+                self._remove_pending(cmd_id)
+
+        if response_d is None:
+            if cmd != 'rset':
                 raise snre.ServiceNoResponseException()
-        else:
-            self.my_store.delete(self.full_response_key)
-            return self.response_d
+            return None
+        await loop.run_in_executor(None, self.my_store.delete,
+                                   full_response_key)
+        return response_d
+
+    def send_many(self,
+                  requests: list,
+                  timeout: int = 500 * MILLISECONDS,
+                  resp_key: str = None) -> list:
+        """Send several commands and collect their responses.
+
+        Note
+        ----
+        All commands are written back-to-back before waiting, so the wait is
+        paid once for the whole batch instead of once per command. Responses
+        arrive on the same persistent watch used by send().
+
+        Args
+        ----
+        requests
+            List of (key, cmd) or (key, cmd, val) tuples. See send().
+        timeout
+            Optional user timeout for the whole batch. Defaults to 500ms
+        resp_key
+            Optional response key for this batch only. See send().
+
+        Returns
+        -------
+        list
+           Response dictionaries in the same order as requests. An entry is
+           None if that command did not respond before the timeout.
+
+        """
+        if len(requests) == 0:
+            return []
+
+        if resp_key is None:
+            resp_key = self.response_key
+        self._ensure_watch(resp_key)
+
+        deadline = time.monotonic() + timeout
+        cmd_ids = [self._gen_cmd_id() for _ in requests]
+        pendings = [self._add_pending(cmd_id) for cmd_id in cmd_ids]
+        try:
+            for cmd_id, req in zip(cmd_ids, requests):
+                key, cmd = req[0], req[1]
+                val = req[2] if len(req) > 2 else ''
+                cmd_dict = self._build_cmd(
+                    cmd, cmd_id, resp_key + '-' + cmd_id, val)
+                self.my_store.put_dict(key, cmd_dict)
+
+            for pending in pendings:
+                pending['event'].wait(
+                    timeout=max(0, deadline - time.monotonic()))
+        finally:
+            for cmd_id, pending in zip(cmd_ids, pendings):
+                if pending['d'] is None:
+                    self._abandon(cmd_id, resp_key + '-' + cmd_id)
+                else:
+                    self._remove_pending(cmd_id)
+
+        rtn = []
+        for cmd_id, pending in zip(cmd_ids, pendings):
+            if pending['d'] is not None:
+                self.my_store.delete(resp_key + '-' + cmd_id)
+            rtn.append(pending['d'])
+        return rtn
@@ -21,25 +21,43 @@
     >>>     print(ae)
 """
 
-import sys
 import time
+import array
 import logging
-import json
-from pathlib import Path
-from pkg_resources import Requirement, resource_filename
+import threading
+import functools
+import collections
+import contextlib
+import struct
+import warnings
 import dsautils.dsa_store as ds
 import dsautils.dsa_syslog as dsl
 import lwautils.ArxException as ARXE
 import lwautils.cmd_rsp as cr
-ETCDCONF = resource_filename(Requirement.parse("lwa-pyutils"),
-                             "lwautils/conf/etcdConfig.yml")
-sys.path.append(str(Path('..')))
+import lwautils.ServiceNoResponseException as snre
+try:
+    # C accelerated parser if available
+    import orjson as json
+except ImportError:
+    import json
+
+
+def __getattr__(name: str):
+    # ETCDCONF is resolved on first use rather than on import
+    if name == 'ETCDCONF':
+        return cr._etcdconf()
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
+
 
 CMD_KEY_BASE = '/cmd/arx/'
 MON_KEY_BASE = '/mon/arx/'
 RESP_KEY_BASE = '/resp/arx/'
+# response key prefix shared by the commands of one multi-board batch
+ALL_RESP_KEY = RESP_KEY_BASE + 'all'
 MILLISECONDS = .001
-# wait for arx board to exec and push to etcd.
+# Typical time for an arx board to exec and push to etcd. Not slept on:
+# responses are awaited on an etcd watch, bounded by the user timeout.
 CMD_TIMEOUT = 0.15  # seconds
 USER_TIMEOUT = 15000 * MILLISECONDS
 RAW_USER_TIMEOUT = 15000 * MILLISECONDS
@@ -69,6 +87,10 @@ MAX_CHAN = 16
 MIN_CHAN = 0
 
 BRD_ID_LEN = 4
+# 'arxn' reply fields returned as is by get_board_info(). 'brd_id' is
+# returned as 'brd_sn'.
+BOARD_INFO_KEYS = ('sw_ver', 'input_coupling', '1wire_temp_count',
+                   '1wire_temp_chan_map')
 
 # the scale is (2.0 A/V)*(.004 V/count) = 8 mA per ADC count.
 BOARD_MA_PER_COUNT = 8.0
@@ -82,10 +104,15 @@ MVOLT_PER_COUNT = 4
 COAX_MA_PER_VOLT = 100
 # fiber milliamp/volt conversion factor
 FIBER_MA_PER_VOLT = 1
+# milliamp/volt conversion factor indexed by input coupling.
+# 0 = coax, 1 = fiber
+MA_PER_VOLT = (COAX_MA_PER_VOLT, FIBER_MA_PER_VOLT)
 
 # for converstion of chan ADC counts to power
 PWR_COUNTS_PER_VOLT = 2.296
 PWR_LOAD_OHMS = 50.0
+# channel power is reported by the service in microwatts
+WATTS_PER_MICROWATT = 1e-6
 MIN_PWR_COUNT = 0
 # check this value
 MAX_PWR_COUNT = 4095
@@ -97,6 +124,9 @@ MIN_LOC = 0
 MIN_BAUD_FACTOR = 1
 MAX_BAUD_FACTOR = 0xFF
 
+# STIM takes 8 hex digits, a 32b unsigned number of seconds
+MAX_TIME = 0xFFFFFFFF
+
 MIN_BRD_ADDR = 0x01
 MAX_BRD_ADDR = 0x7e
 
@@ -107,9 +137,52 @@ FIRST_ATTEN_START_BIT = 3
 SECOND_ATTEN_MASK = 0x7e00
 SECOND_ATTEN_START_BIT = 9
 
+# Command arguments for every valid channel and memory location, indexed
+# after the value has been range checked.
+CHAN_HEX1 = tuple('{:1X}'.format(chan) for chan in range(MAX_CHAN))
+CHAN_HEX2 = tuple('{:02X}'.format(chan) for chan in range(MAX_CHAN))
+LOC_STR = tuple('{}'.format(loc) for loc in range(MAX_LOC))
+
+# (b0, sig_on) -> b1. The signal is on when b1 equals the highpass bit b0.
+SIG_BIT = {(b0, on): (b0 if on else b0 ^ 1)
+           for b0 in (0, 1) for on in (False, True)}
+
+# %-formats for channel configuration payloads. These run once per channel
+# in batch writes, where %-formatting is cheaper than str.format().
+CHAN_CFG_FMT = '%X%04X'
+# packs all channel words big endian for the 'sets' payload
+ALL_CHAN_CFG_STRUCT = struct.Struct('>{}H'.format(MAX_CHAN))
+# bit legend printed by _show_chan_cfg(verbose=True)
+CHAN_CFG_BIT_DEFS = '\n'.join((
+    "b0 = highpass filter (0=wide, 1=narrow)",
+    "b1 = signal on when b1 == b0. off otherwise",
+    "b2 = lowpass filter (0=wide, 1=narrow)",
+    "b3:b8 = first attenuation (inverted) in steps of 0.5dB. Max=63(31.5dB)",
+    "b9:b14 = second attenuation (inverted) in steps of 0.5dB Max=63(31.5dB)",
+    "b15 = dc power state (1=on, 0=off)"))
+
 MIN_HASH_IDX = 10
 MAX_HASH_IDX = 15
 
+# Commands that only read board state. Their responses may be cached when
+# ARX is created with a cache_ttl. Any other command invalidates the cache
+# of the board it is sent to.
+READ_ONLY_CMDS = frozenset(['getc', 'geta', 'arxn', 'anlg', 'powc', 'powa',
+                            'curc', 'cura', 'curb', 'temp', 'owte', 'owdc',
+                            'owsn'])
+# Seconds to cache read-only commands whose data changes at a known rate,
+# overriding the ARX cache_ttl.
+CMD_CACHE_TTL = {
+    'temp': 1.0,
+    'owte': 1.0,
+    'powc': 0.1,
+    'powa': 0.1,
+    'cura': 0.05,
+}
+# Most responses an ARX object keeps cached. The least recently used are
+# dropped first.
+MAX_CACHE_ENTRIES = 1024
+
 ANLG_ERRORS = {31: "Invalid channel number"}
 
 SET_CHAN_CFG_ERRORS = {
@@ -157,25 +230,193 @@ COMM_ERRORS = {
     33: "Attempt to change baud rate failed"
 }
 
+@functools.lru_cache(maxsize=128)
+def _keys_for(arx_addr: int) -> tuple:
+    """Return the (command key, response key) pair for a board address.
+    """
+    return ('{}{}'.format(CMD_KEY_BASE, arx_addr),
+            '{}{}'.format(RESP_KEY_BASE, arx_addr))
+
+
+@functools.lru_cache(maxsize=256)
+def _cfg_hex(chan_cfg: int) -> str:
+    """Return the 4 digit hex string of a channel configuration word.
+    """
+    return '%04X' % chan_cfg
+
+
+def _all_chan_cfg_cmd(words) -> tuple:
+    """Return the (cmd, payload, errors) writing words to all channels.
+
+    Note
+    ----
+    'seta' with a single 4 digit word if all MAX_CHAN words are the same,
+    'sets' with every word as big endian hex otherwise.
+
+    """
+    if words.count(words[0]) == MAX_CHAN:
+        return 'seta', _cfg_hex(words[0]), SET_ALL_CHAN_CFG_ERRORS
+    return ('sets', ALL_CHAN_CFG_STRUCT.pack(*words).hex().upper(),
+            SET_ALL_DIFFERENT_CHAN_CFG_ERRORS)
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_err(err_msg_json: str) -> dict:
+    """Return the parsed JSON error reply. Must not be changed by callers.
+    """
+    return json.loads(err_msg_json)
+
+
+def _crc8_byte(val: int) -> int:
+    """Return the Dallas/Maxim 1wire CRC8 (x^8 + x^5 + x^4 + 1) of one byte.
+    """
+    for _ in range(8):
+        val = (val >> 1) ^ 0x8C if val & 1 else val >> 1
+    return val
+
+
+# 1wire CRC8 lookup table, one entry per byte value
+ONEWIRE_CRC8_TABLE = bytes(_crc8_byte(val) for val in range(256))
+
+
+def _check_1wire_sn(sn: str):
+    """Check the CRC byte of a 1wire serial number.
+
+    Note
+    ----
+    The firmware returns the 64 bit ROM code MSB first, so the CRC byte
+    comes first and the family code last. The CRC8 of the ROM code in
+    1wire byte order, CRC byte included, is 0.
+
+    Raises
+    ------
+    ArxException
+        sn is not 16 hex digits or its CRC does not match.
+
+    """
+    try:
+        rom = bytes.fromhex(sn)
+    except (TypeError, ValueError):
+        rom = b''
+    if len(rom) != 8:
+        raise ARXE.ArxException(
+            "Invalid 1wire serial number: {}".format(sn))
+    crc = 0
+    for val in reversed(rom):
+        crc = ONEWIRE_CRC8_TABLE[crc ^ val]
+    if crc:
+        raise ARXE.ArxException(
+            "1wire serial number CRC mismatch: {}".format(sn))
+
+
+# Syslogger shared by all ARX objects in the process. See _get_log().
+_LOG = None
+
+# etcd clients shared by all ARX objects in the process.
+# conf path -> DsaStore
+_STORES = {}
+_CMD_RSP = None
+_CLIENT_LOCK = threading.Lock()
+# ARX object returned by ARX.shared()
+_SHARED_ARX = None
+_SHARED_LOCK = threading.Lock()
+
+
+def _get_log() -> dsl.DsaSyslogger:
+    """Return the process wide ARX syslogger, creating it on first use.
+
+    Note
+    ----
+    Importing this module for its constants does not set up syslog.
+
+    """
+    global _LOG
+    with _CLIENT_LOCK:
+        if _LOG is None:
+            _LOG = dsl.DsaSyslogger('lwa', 'arx', logging.INFO, 'Arx')
+    return _LOG
+
+
+def _get_clients(conf: str) -> tuple:
+    """Return the process wide (DsaStore, CmdRsp) pair for conf.
+
+    Note
+    ----
+    Creating an ARX object then does not open a new etcd connection.
+
+    """
+    global _CMD_RSP
+    with _CLIENT_LOCK:
+        if _CMD_RSP is None:
+            _CMD_RSP = cr.CmdRsp('LWA')
+            # one watch serves the response keys of every board
+            _CMD_RSP.watch_prefix(RESP_KEY_BASE)
+        store = _STORES.get(conf)
+        if store is None:
+            if conf == cr._etcdconf():
+                # the default configuration reuses the CmdRsp connection
+                store = _CMD_RSP.my_store
+            else:
+                store = ds.DsaStore(conf)
+            _STORES[conf] = store
+    return store, _CMD_RSP
+
+
+def close_clients():
+    """Cancel the shared response watch and forget the shared etcd clients.
+
+    Note
+    ----
+    ARX objects created afterwards open new clients. Intended for test
+    teardown and process shutdown.
+
+    """
+    global _CMD_RSP, _SHARED_ARX
+    with _SHARED_LOCK:
+        _SHARED_ARX = None
+    with _CLIENT_LOCK:
+        if _CMD_RSP is not None:
+            _CMD_RSP.close()
+        _CMD_RSP = None
+        _STORES.clear()
+
+
 class ARX:
-    def __init__(self, conf: str = None):
+    __slots__ = ('my_store', 'my_cr', 'cmd_key_base', 'mon_key_base',
+                 'resp_key_base', 'log', 'chan_cfg', 'chan_cfg_signal_on',
+                 'cmd_id', 'arx_addr', 'brd_sn', 'sw_ver', 'input_coupling',
+                 'onewire_temp_count', 'onewire_temp_chan_map', 'cache_ttl',
+                 '_cache', '_cache_lock', '_cache_epoch', '_board_info', '_onewire_sn',
+                 '_dirty')
+
+    # get_board_id() warns only on its first call in the process
+    _board_id_warned = False
+
+    def __init__(self, conf: str = None, cache_ttl: float = None):
         """c-tor. Controls and Monitors ARX boards.
 
+        Args
+        ----
+        conf
+            Optional etcd configuration file.
+        cache_ttl
+            Optional. Seconds to reuse responses of read-only commands.
+            Commands in CMD_CACHE_TTL use their own TTL instead.
+            Defaults to None which disables caching.
+
         """
-        print(ETCDCONF)
-        if conf is not None:
-            self.my_store = ds.DsaStore(conf)
-        else:
-            self.my_store = ds.DsaStore(ETCDCONF)
-        self.my_cr = cr.CmdRsp('LWA')
+        self.my_store, self.my_cr = _get_clients(
+            conf if conf is not None else cr._etcdconf())
         self.cmd_key_base = CMD_KEY_BASE
         self.mon_key_base = MON_KEY_BASE
         self.resp_key_base = RESP_KEY_BASE
-        self.log = dsl.DsaSyslogger('lwa', 'arx', logging.INFO, 'Arx')
-        self.log.function('c-tor')
+        self.log = _get_log()
         self.log.info("Created Arx object")
-        self.chan_cfg = MAX_CHAN * [0]
+        # fixed width 16 bit words, one per channel
+        self.chan_cfg = array.array('H', MAX_CHAN * [0])
         self.chan_cfg_signal_on = MAX_CHAN * [True]
+        # channels changed locally since they were last sent to a board
+        self._dirty = set()
         self.cmd_id = ""
         self.arx_addr = -1
         self.brd_sn = None
@@ -183,6 +424,38 @@ class ARX:
         self.input_coupling = None
         self.onewire_temp_count = None
         self.onewire_temp_chan_map = None
+        self.cache_ttl = cache_ttl
+        # (arx_addr, cmd, val) -> (expiry, response dictionary)
+        self._cache = collections.OrderedDict()
+        self._cache_lock = threading.Lock()
+        # bumped by every invalidation so replies to commands sent before
+        # it are not cached afterwards
+        self._cache_epoch = 0
+        # arx_addr -> get_board_info() dictionary
+        self._board_info = {}
+        # (arx_addr, dev_num) -> 1-wire serial number
+        self._onewire_sn = {}
+
+    @classmethod
+    def shared(cls):
+        """Return the process wide ARX object with the default configuration.
+
+        Note
+        ----
+        Every ARX object already shares one etcd connection. Reusing this
+        object also shares its cached board information.
+
+        Returns
+        -------
+        ARX
+            The same object on every call until close_clients().
+
+        """
+        global _SHARED_ARX
+        with _SHARED_LOCK:
+            if _SHARED_ARX is None:
+                _SHARED_ARX = cls()
+            return _SHARED_ARX
 
 
     def _check_brd_addr(self, brd_addr: int):
@@ -207,31 +480,51 @@ class ARX:
         if atten < MIN_ATTENUATION or atten > MAX_ATTENUATION:
             raise ARXE.ArxException("Invalid attenuation: {}".format(atten))
 
-    def _set_local_chan_cfg(self, chan: int, chan_cfg: dict):
-        self._check_config_dict(chan_cfg)
+    def _encode_cfg(self, chan_cfg: dict) -> int:
+        """Helper to encode a channel configuration dictionary.
+
+        Note
+        ----
+        b0 is the highpass filter (1=narrow), b1 turns the signal on when it
+        equals b0, b2 is the lowpass filter (1=narrow), b3:b8 and b9:b14 are
+        the inverted first and second attenuations and b15 turns DC on.
 
-        self._set_chan_cfg_signal_on_state(chan, chan_cfg[SIG_ON])
+        Args
+        ----
+        chan_cfg
+           Channel configuration dictionary. See set_chan_cfg().
 
-        if chan_cfg[NARROW_HPF]:
-            self._set_chan_cfg_highpass_narrow(chan)
-        else:
-            self._set_chan_cfg_highpass_wide(chan)
+        Returns
+        -------
+        int
+           16 bit channel configuration word.
 
-        if chan_cfg[NARROW_LPF]:
-            self._set_chan_cfg_lowpass_narrow(chan)
-        else:
-            self._set_chan_cfg_lowpass_wide(chan)
-
-        atten = int(chan_cfg[FIRST_ATTEN] / ATTEN_SCALE)
-        self._check_attenuation(atten)
-        self._set_chan_cfg_first_atten(chan, atten)
-        atten = int(chan_cfg[SECOND_ATTEN] / ATTEN_SCALE)
-        self._check_attenuation(atten)
-        self._set_chan_cfg_second_atten(chan, atten)
-        if chan_cfg[DC_ON]:
-            self._set_chan_cfg_input_dc_pwr_on(chan)
-        else:
-            self._set_chan_cfg_input_dc_pwr_off(chan)
+        Raises
+        ------
+        ArxException
+           Missing keys or invalid attenuation.
+
+        """
+        self._check_config_dict(chan_cfg)
+        atten1 = int(chan_cfg[FIRST_ATTEN] / ATTEN_SCALE)
+        self._check_attenuation(atten1)
+        atten2 = int(chan_cfg[SECOND_ATTEN] / ATTEN_SCALE)
+        self._check_attenuation(atten2)
+
+        hpf = 1 if chan_cfg[NARROW_HPF] else 0
+        sig = SIG_BIT[(hpf, bool(chan_cfg[SIG_ON]))]
+        return (hpf | (sig << 1) | ((1 if chan_cfg[NARROW_LPF] else 0) << 2)
+                | ((~atten1 & 0x3F) << FIRST_ATTEN_START_BIT)
+                | ((~atten2 & 0x3F) << SECOND_ATTEN_START_BIT)
+                | ((1 if chan_cfg[DC_ON] else 0) << 15))
+
+    def _set_local_chan_cfg(self, chan: int, chan_cfg: dict):
+        # inlined _check_channel(), this runs for every channel of a batch
+        if not MIN_CHAN <= chan < MAX_CHAN:
+            raise ARXE.ArxException("Invalid channel number: {}".format(chan))
+        self.chan_cfg[chan] = self._encode_cfg(chan_cfg)
+        self.chan_cfg_signal_on[chan] = chan_cfg[SIG_ON]
+        self._dirty.add(chan)
 
     def _getBoardSN(self, brd_id: str) -> int:
         brd_hex_sn = brd_id[:BRD_ID_LEN]
@@ -252,15 +545,8 @@ class ARX:
         return pwr
 
     def _get_atten(self, att: int, mask: int, start_bit: int, val: int) -> int:
-        b = (att ^ 0xFFFF) & 0x3F
-
-        # clear b9:b14
-        val &= ~mask
-
-        # set b9:b14 with b
-        val |= (b << start_bit)
-
-        return val
+        # clear the attenuation bits of val and insert the inverted att
+        return (val & ~mask) | ((~att & 0x3F) << start_bit)
 
     def _check_time(self, time0: int):
         """Helper to check range of time.
@@ -278,7 +564,10 @@ class ARX:
         """
 
         if time0 < 0:
-            raise ARXE.ArxException("time must be > 0. time= {}".format(time))
+            raise ARXE.ArxException("time must be > 0. time= {}".format(time0))
+        if time0 > MAX_TIME:
+            raise ARXE.ArxException(
+                "time must be <= {}. time= {}".format(MAX_TIME, time0))
 
     def _check_rtn(self, rtn: dict, errors: dict = None):
         """Helper to check errors in rtn
@@ -296,26 +585,47 @@ class ARX:
             Contains ARX error messages if any
 
         """
-        # print("_check_rtn: rtn: {}".format(rtn))
         err_msg_json = rtn['err_str']
+        # success is by far the common case, keep it to one compare
+        if err_msg_json == "":
+            return ""
+        self._raise_err(err_msg_json, errors)
+
+    def _raise_err(self, err_msg_json: str, errors: dict = None):
+        """Helper to raise the error in a non-empty err_str.
+
+        Args
+        ----
+        err_msg_json
+           err_str of the returned dictionary.
+        errors
+           Dictionary mapping error numbers to strings
+
+        Raises
+        ------
+        ArxException
+            Contains ARX error messages
+
+        """
         if err_msg_json is None:
             raise ARXE.ArxException("Return is None")
-        if err_msg_json != "":
-            try:
-                # print("_check_rtn: err_msg_json: {}".format(err_msg_json))
-                err = json.loads(err_msg_json)
-            except:
-                raise ARXE.ArxException("Unable to parse json error msg")
-            if errors is not None and err['ERR'] == 'NAK':
-                err_msg = "{} {} - {}".format(err['ERR'], err['MSG'],
-                                              errors[int(err['MSG'])])
-                raise ARXE.ArxException(err_msg)
-            elif err['ERR'] != 'NAK':
-                err_msg = "{} {}".format(err['ERR'], err['MSG'])
-                raise ARXE.ArxException(err_msg)
-            raise ARXE.ArxException(err_msg_json)
-
-        return ""
+        # error replies are JSON objects, skip the parser for anything else
+        if not err_msg_json.startswith('{'):
+            raise ARXE.ArxException("Unable to parse json error msg")
+        try:
+            # boards repeat the same few errors, parse each one once
+            err = _parse_err(err_msg_json)
+        except:
+            raise ARXE.ArxException("Unable to parse json error msg")
+        if errors is not None and err['ERR'] == 'NAK':
+            err_msg = "{} {} - {}".format(
+                err['ERR'], err['MSG'],
+                errors.get(int(err['MSG']), "Unknown error"))
+            raise ARXE.ArxException(err_msg)
+        elif err['ERR'] != 'NAK':
+            err_msg = "{} {}".format(err['ERR'], err['MSG'])
+            raise ARXE.ArxException(err_msg)
+        raise ARXE.ArxException(err_msg_json)
 
     def _check_channel(self, chan: int):
         """Helper to check range of channel
@@ -327,7 +637,7 @@ class ARX:
 
         """
 
-        if chan < MIN_CHAN or chan > MAX_CHAN - 1:
+        if not MIN_CHAN <= chan < MAX_CHAN:
             raise ARXE.ArxException("Invalid channel number: {}".format(chan))
 
     def _check_location(self, loc: int):
@@ -358,6 +668,140 @@ class ARX:
             raise ARXE.ArxException(
                 "Invalid 1-wire number: {}".format(dev_num))
 
+    def _send_all(self,
+                  arx_addrs: list,
+                  cmd: str,
+                  val: str = '',
+                  user_timeout: int = USER_TIMEOUT) -> dict:
+        """Private helper to send the same command to several ARX boards.
+
+        Note
+        ----
+        All commands are written back-to-back and their responses awaited
+        together with CmdRsp.send_many(), so N boards cost about one round
+        trip instead of N.
+
+        Args
+        ----
+        arx_addrs
+            ARX board addresses
+        cmd
+            An ARX board command.
+        val
+            Args if any for ARX command
+        user_timeout
+            User specified timeout for the whole batch.
+
+        Returns
+        -------
+        dict
+            Board address -> response dictionary, or None if the board did
+            not respond.
+
+        Raises
+        ------
+        ArxException
+           Invalid board address.
+
+        """
+
+        arx_addrs = list(arx_addrs)
+        for arx_addr in arx_addrs:
+            self._check_brd_addr(arx_addr)
+        write = self.cache_ttl and cmd not in READ_ONLY_CMDS
+        if write:
+            for arx_addr in arx_addrs:
+                self.invalidate_cache(arx_addr)
+
+        reqs = [(_keys_for(arx_addr)[0], cmd, val) for arx_addr in arx_addrs]
+        try:
+            rtns = self.my_cr.send_many(reqs, user_timeout,
+                                        resp_key=ALL_RESP_KEY)
+        finally:
+            if write:
+                # drop reads that were answered before the boards applied it
+                for arx_addr in arx_addrs:
+                    self.invalidate_cache(arx_addr)
+
+        return dict(zip(arx_addrs, rtns))
+
+    def _send_batch(self,
+                    arx_addr: int,
+                    cmds: list,
+                    user_timeout: int = USER_TIMEOUT) -> list:
+        """Private helper to send several commands to one ARX board.
+
+        Note
+        ----
+        The commands are written back-to-back and their responses awaited
+        together with CmdRsp.send_many(), so N commands cost about one
+        round trip instead of N.
+
+        Args
+        ----
+        arx_addr
+            ARX board address
+        cmds
+            List of (cmd, val) tuples.
+        user_timeout
+            User specified timeout for the whole batch.
+
+        Returns
+        -------
+        list
+            Response dictionaries in the same order as cmds.
+
+        Raises
+        ------
+        ArxException
+           Invalid board address.
+        ServiceNoResponseException
+           A command did not respond within user_timeout.
+
+        """
+
+        self._check_brd_addr(arx_addr)
+        write = self.cache_ttl and any(cmd not in READ_ONLY_CMDS
+                                       for cmd, _ in cmds)
+        if write:
+            self.invalidate_cache(arx_addr)
+
+        cmd_key, key = _keys_for(arx_addr)
+        try:
+            rtns = self.my_cr.send_many(
+                [(cmd_key, cmd, val) for cmd, val in cmds], user_timeout,
+                resp_key=key)
+        finally:
+            if write:
+                # drop reads that were answered before the board applied it
+                self.invalidate_cache(arx_addr)
+        if None in rtns:
+            raise snre.ServiceNoResponseException()
+        return rtns
+
+    def invalidate_cache(self, arx_addr: int = None):
+        """Drop cached responses of read-only commands.
+
+        Note
+        ----
+        Commands sent through this object already invalidate the cache of
+        their board. Use this after a board was changed by another process
+        or by hand.
+
+        Args
+        ----
+        arx_addr
+            Optional ARX board address. Defaults to None for all boards.
+
+        """
+        with self._cache_lock:
+            self._cache_epoch += 1
+            if arx_addr is None:
+                self._cache.clear()
+            else:
+                for k in [k for k in self._cache if k[0] == arx_addr]:
+                    del self._cache[k]
+
     def _send(self,
               arx_addr: int,
               cmd: str,
@@ -379,16 +823,97 @@ class ARX:
         Returns
         -------
 
-        """
+        Raises
+        ------
+        ArxException
+           Invalid board address.
 
-        key = '{}{}'.format(RESP_KEY_BASE, arx_addr)
-        self.my_cr.set_response_key(key)
+        """
 
-        cmd_key = '{}{}'.format(CMD_KEY_BASE, arx_addr)
-        rtn = self.my_cr.send(cmd_key, cmd, val, user_timeout)
+        # fail fast on bad addresses instead of waiting out the timeout
+        self._check_brd_addr(arx_addr)
+
+        epoch = None
+        write = False
+        if self.cache_ttl:
+            if cmd in READ_ONLY_CMDS:
+                with self._cache_lock:
+                    hit = self._cache.get((arx_addr, cmd, val))
+                    if hit is not None and hit[0] > time.monotonic():
+                        self._cache.move_to_end((arx_addr, cmd, val))
+                        return hit[1]
+                    epoch = self._cache_epoch
+            else:
+                write = True
+                self.invalidate_cache(arx_addr)
+
+        # The response key is passed per command rather than set on the
+        # shared CmdRsp so _send() can be called from several threads.
+        cmd_key, key = _keys_for(arx_addr)
+        try:
+            rtn = self.my_cr.send(cmd_key, cmd, val, user_timeout,
+                                  resp_key=key)
+        finally:
+            if write:
+                # A read sent while this write was in flight may have been
+                # answered before the board applied it. Bumping the epoch
+                # again keeps such a read out of the cache.
+                self.invalidate_cache(arx_addr)
+
+        # only cache successful replies that no write may have outdated
+        if (self.cache_ttl and cmd in READ_ONLY_CMDS
+                and rtn.get('err_str') == ''):
+            with self._cache_lock:
+                if epoch != self._cache_epoch:
+                    return rtn
+                self._cache[(arx_addr, cmd, val)] = (
+                    time.monotonic() + CMD_CACHE_TTL.get(cmd, self.cache_ttl),
+                    rtn)
+                self._cache.move_to_end((arx_addr, cmd, val))
+                if len(self._cache) > MAX_CACHE_ENTRIES:
+                    self._cache.popitem(last=False)
 
         return rtn
 
+    def _cmd(self,
+             arx_addr: int,
+             cmd: str,
+             val: str = '',
+             key: str = None,
+             errors: dict = None,
+             user_timeout: int = USER_TIMEOUT):
+        """Private helper to send a command, check it and pick the reply.
+
+        Args
+        ----
+        arx_addr
+            ARX board address
+        cmd
+            An ARX board command.
+        val
+            Args if any for ARX command
+        key
+            Response key to return. Defaults to None for the whole response.
+        errors
+            Dictionary mapping error numbers to strings
+        user_timeout
+            User specified timeout on command. Defaults to 500ms
+
+        Returns
+        -------
+        Response value at key, or the response dictionary if key is None.
+
+        Raises
+        ------
+        ArxException
+           Any ARX errors.
+
+        """
+
+        rtn = self._send(arx_addr, cmd, val, user_timeout)
+        self._check_rtn(rtn, errors)
+        return rtn[key] if key else rtn
+
     def _set_chan_cfg_highpass_wide(self, chan: int):
         """Set a channel's hightpass filter to wide.
 
@@ -407,11 +932,11 @@ class ARX:
         set_chan_cfg()
 
         """
+
+        self._check_channel(chan)
+
         self.chan_cfg[chan] &= ~(1)
-        if self.chan_cfg_signal_on[chan]:
-            self._set_chan_cfg_signal_bit_on(chan)
-        else:
-            self._set_chan_cfg_signal_bit_off(chan)
+        self._set_chan_cfg_signal_bit(chan)
 
     def _set_chan_cfg_highpass_narrow(self, chan: int):
         """Set a channel's highpass filter to narrow.
@@ -440,10 +965,7 @@ class ARX:
         self._check_channel(chan)
 
         self.chan_cfg[chan] |= 0x01
-        if self.chan_cfg_signal_on[chan]:
-            self._set_chan_cfg_signal_bit_on(chan)
-        else:
-            self._set_chan_cfg_signal_bit_off(chan)
+        self._set_chan_cfg_signal_bit(chan)
 
     def _set_chan_cfg_signal_on_state(self, chan: int, val: bool = True):
         """Set a channel's signal on state.
@@ -473,13 +995,10 @@ class ARX:
         self._check_channel(chan)
 
         self.chan_cfg_signal_on[chan] = val
-        if val:
-            self._set_chan_cfg_signal_bit_on(chan)
-        else:
-            self._set_chan_cfg_signal_bit_off(chan)
+        self._set_chan_cfg_signal_bit(chan)
 
-    def _set_chan_cfg_signal_bit_on(self, chan: int):
-        """Helper to set a channel's signal bit to ON.
+    def _set_chan_cfg_signal_bit(self, chan: int):
+        """Helper to set a channel's signal bit from its signal on state.
 
         Note
         ----
@@ -491,29 +1010,16 @@ class ARX:
         chan
             Channel number. 0 indexed.
 
-        Raises
-        ------
-        ArxException
-           Any ARX errors.
-
         See Also
         --------
         set_chan_cfg()
 
         """
 
-        b0 = self.chan_cfg[chan] & 0x0001
-        if b0 == 0:
-            self.chan_cfg[chan] &= ~(1 << 1)
-        else:
-            self.chan_cfg[chan] |= (1 << 1)
-
-    def _set_chan_cfg_signal_bit_off(self, chan: int):
-        b0 = self.chan_cfg[chan] & 0x0001
-        if b0 == 0:
-            self.chan_cfg[chan] |= (1 << 1)
-        else:
-            self.chan_cfg[chan] &= ~(1 << 1)
+        word = self.chan_cfg[chan]
+        self.chan_cfg[chan] = (word & ~2) | (
+            SIG_BIT[(word & 1, bool(self.chan_cfg_signal_on[chan]))] << 1)
+        self._dirty.add(chan)
 
     def _set_chan_cfg_lowpass_wide(self, chan: int):
         """Set a channel's lowpass filter to wide.
@@ -542,6 +1048,7 @@ class ARX:
         self._check_channel(chan)
         # 1=narrow, 0=wide. 
         self.chan_cfg[chan] &= ~(1 << 2)
+        self._dirty.add(chan)
 
     def _set_chan_cfg_lowpass_narrow(self, chan: int):
         """Set a channel's lowpass filter to narrow.
@@ -569,6 +1076,7 @@ class ARX:
         self._check_channel(chan)
         # 1=narrow, 0=wide. 
         self.chan_cfg[chan] |= (1 << 2)
+        self._dirty.add(chan)
 
     def _set_chan_cfg_input_dc_pwr_on(self, chan: int):
         """Set a channel's DC power to ON.
@@ -597,6 +1105,7 @@ class ARX:
         self._check_channel(chan)
 
         self.chan_cfg[chan] |= (1 << 15)
+        self._dirty.add(chan)
 
     def _set_chan_cfg_input_dc_pwr_off(self, chan: int):
         """Set a channel's DC power to OFF.
@@ -621,7 +1130,11 @@ class ARX:
         set_chan_cfg()
 
         """
+
+        self._check_channel(chan)
+
         self.chan_cfg[chan] &= ~(1 << 15)
+        self._dirty.add(chan)
 
     def _set_chan_cfg_first_atten(self, chan: int, val: int):
         """Set first attenuation value for specified channel in dB
@@ -649,14 +1162,8 @@ class ARX:
 
         """
 
-        self._check_channel(chan)
-
-        if val < 0 or val > 63:
-            raise ARXE.ArxException(
-                "Invalid first atten setting: {}".format(val))
-        self.chan_cfg[chan] = self._get_atten(val, FIRST_ATTEN_MASK,
-                                              FIRST_ATTEN_START_BIT,
-                                              self.chan_cfg[chan])
+        self._set_chan_cfg_atten(chan, val, FIRST_ATTEN_MASK,
+                                 FIRST_ATTEN_START_BIT, 'first')
 
     def _set_chan_cfg_second_atten(self, chan: int, val: int):
         """Set second attenuation value for specified channel in dB
@@ -684,20 +1191,47 @@ class ARX:
 
         """
 
+        self._set_chan_cfg_atten(chan, val, SECOND_ATTEN_MASK,
+                                 SECOND_ATTEN_START_BIT, 'second')
+
+    def _set_chan_cfg_atten(self, chan: int, val: int, mask: int,
+                            start_bit: int, which: str):
+        """Helper to set one attenuation value for specified channel.
+
+        Args
+        ----
+        chan
+           Channel number to set
+        val
+           Attenuation value in units of 0.5db
+        mask
+           Mask of the attenuation bits.
+        start_bit
+           Lowest attenuation bit.
+        which
+           'first' or 'second', for the error message.
+
+        Raises
+        ------
+        ArxException
+           Invalid channel or attenuation value.
+
+        """
+
         self._check_channel(chan)
 
-        if val < 0 or val > 63:
+        if val < MIN_ATTENUATION or val > MAX_ATTENUATION:
             raise ARXE.ArxException(
-                "Invalid first atten setting: {}".format(val))
-
-        self.chan_cfg[chan] = self._get_atten(val, SECOND_ATTEN_MASK,
-                                              SECOND_ATTEN_START_BIT,
+                "Invalid {} atten setting: {}".format(which, val))
+        self.chan_cfg[chan] = self._get_atten(val, mask, start_bit,
                                               self.chan_cfg[chan])
+        self._dirty.add(chan)
 
     def _show_chan_cfg(self,
                        chan: int,
                        verbose: bool = False,
-                       cfg: int = None):
+                       cfg: int = None,
+                       as_string: bool = False):
         """Show the binary representation of the channel configuration.
 
         Args
@@ -709,6 +1243,13 @@ class ARX:
         cfg
             16b integer representation of channel configuration.
             If None, then internal configuration is shown.
+        as_string
+            True to return the text instead of printing it.
+
+        Returns
+        -------
+        str
+            The text when as_string is True, otherwise None.
 
         Raises
         ------
@@ -740,22 +1281,12 @@ class ARX:
 
         self._check_channel(chan)
 
-        if cfg is None:
-            print("{:016b}".format(self.chan_cfg[chan]))
-        else:
-            print("{:016b}".format(cfg))
-
+        text = format(self.chan_cfg[chan] if cfg is None else cfg, '016b')
         if verbose:
-            print("b0 = highpass filter (0=wide, 1=narrow)")
-            print("b1 = signal on when b1 == b0. off otherwise")
-            print("b2 = lowpass filter (0=wide, 1=narrow)")
-            print(
-                "b3:b8 = first attenuation (inverted) in steps of 0.5dB. Max=63(31.5dB)"
-            )
-            print(
-                "b9:b14 = second attenuation (inverted) in steps of 0.5dB Max=63(31.5dB)"
-            )
-            print("b15 = dc power state (1=on, 0=off)")
+            text = '\n'.join((text, CHAN_CFG_BIT_DEFS))
+        if as_string:
+            return text
+        print(text)
 
     def set_chan_cfg(self,
                      arx_addr: int,
@@ -786,6 +1317,74 @@ class ARX:
         self._set_local_chan_cfg(chan, chan_cfg)
         self._set_chan_cfg(arx_addr, chan, user_timeout)
 
+    def set_chan_cfg_many(self,
+                          chan_cfgs: list,
+                          user_timeout: int = USER_TIMEOUT):
+        """Set channel configurations on several ARX boards at once.
+
+        Note
+        ----
+        All commands are written back-to-back and their responses awaited
+        together, so they cost about one round trip instead of one per
+        command. The local channel configuration is not changed.
+
+        Args
+        ----
+        chan_cfgs
+           List of (arx_addr, chan, chan_cfg) tuples. See set_chan_cfg().
+        user_timeout
+           User specified timeout for the whole batch.
+
+        Raises
+        ------
+        ArxException
+           Lists every command that did not respond or returned an error.
+           Raised after all commands have been sent.
+
+        See Also
+        --------
+        set_chan_cfg()
+
+        """
+
+        reqs = []
+        for arx_addr, chan, chan_cfg in chan_cfgs:
+            self._check_brd_addr(arx_addr)
+            self._check_channel(chan)
+            reqs.append((arx_addr, CHAN_CFG_FMT % (
+                chan, self._encode_cfg(chan_cfg))))
+        if len(reqs) == 0:
+            return
+
+        arx_addrs = set(arx_addr for arx_addr, _ in reqs)
+        if self.cache_ttl:
+            for arx_addr in arx_addrs:
+                self.invalidate_cache(arx_addr)
+        try:
+            rtns = self.my_cr.send_many(
+                [(_keys_for(arx_addr)[0], 'setc', val)
+                 for arx_addr, val in reqs],
+                user_timeout, resp_key=ALL_RESP_KEY)
+        finally:
+            if self.cache_ttl:
+                # drop reads that were answered before the boards applied it
+                for arx_addr in arx_addrs:
+                    self.invalidate_cache(arx_addr)
+
+        errs = []
+        for (arx_addr, val), rtn in zip(reqs, rtns):
+            if rtn is None:
+                errs.append("{} setc {}: no response".format(arx_addr, val))
+                continue
+            try:
+                self._check_rtn(rtn, SET_CHAN_CFG_ERRORS)
+            except ARXE.ArxException as exc:
+                errs.append("{} setc {}: {}".format(arx_addr, val, exc))
+        if errs:
+            raise ARXE.ArxException(
+                "Unable to set channel configurations. {}".format(
+                    "; ".join(errs)))
+
     def _set_chan_cfg(self,
                       arx_addr: int,
                       chan: int,
@@ -827,10 +1426,12 @@ class ARX:
 
         self._check_channel(chan)
 
-        chan_cfg_str = "{:1X}{:04X}".format(chan, self.chan_cfg[chan])
+        chan_cfg_str = CHAN_CFG_FMT % (chan, self.chan_cfg[chan])
         rtn = self._send(arx_addr, 'setc', chan_cfg_str, user_timeout)
 
-        return self._check_rtn(rtn, SET_CHAN_CFG_ERRORS)
+        rtn = self._check_rtn(rtn, SET_CHAN_CFG_ERRORS)
+        self._dirty.discard(chan)
+        return rtn
 
     def get_chan_cfg(self,
                      arx_addr: int,
@@ -865,29 +1466,20 @@ class ARX:
 
         See Also
         --------
+        get_all_chan_cfg()
         set_chan_cfg()
         set_all_chan_cfg()
         set_all_different_chan_cfg()
 
         """
-        chan_cfg = self._get_chan_cfg(arx_addr, chan, user_timeout)
-        # self._show_chan_cfg(0, chan_cfg)
-        lpf_narrow = self._get_lpf(chan_cfg)
-        hpf_narrow = self._get_hpf(chan_cfg)
-        sig_on = self._is_sig_on(chan_cfg)
-        first_atten = self._get_first_atten(chan_cfg) * ATTEN_SCALE
-        second_atten = self._get_second_atten(chan_cfg) * ATTEN_SCALE
-        dc_on = self._is_dc_on(chan_cfg)
-
-        rtn = {}
-        rtn[SIG_ON] = sig_on
-        rtn[NARROW_LPF] = (lpf_narrow == 1)
-        rtn[NARROW_HPF] = (hpf_narrow == 1)
-        rtn[FIRST_ATTEN] = first_atten
-        rtn[SECOND_ATTEN] = second_atten
-        rtn[DC_ON] = dc_on
-
-        return rtn
+        if self.cache_ttl:
+            # Reading one channel usually means reading all of them. One
+            # cached 'geta' serves every channel instead of 16 'getc'.
+            self._check_channel(chan)
+            chan_cfg = self._get_all_chan_cfg(arx_addr, user_timeout)[chan]
+        else:
+            chan_cfg = self._get_chan_cfg(arx_addr, chan, user_timeout)
+        return self._decode_cfg(chan_cfg)
 
     def get_all_chan_cfg(self,
                          arx_addr: int,
@@ -926,47 +1518,39 @@ class ARX:
 
         """
         chan_cfgs = self._get_all_chan_cfg(arx_addr, user_timeout)
-        #self._show_chan_cfg(0, chan_cfg)
-        rtn = []
-        for chan_cfg in chan_cfgs:
-            lpf_narrow = self._get_lpf(chan_cfg)
-            hpf_narrow = self._get_hpf(chan_cfg)
-            sig_on = self._is_sig_on(chan_cfg)
-            first_atten = self._get_first_atten(chan_cfg) * ATTEN_SCALE
-            second_atten = self._get_second_atten(chan_cfg) * ATTEN_SCALE
-            dc_on = self._is_dc_on(chan_cfg)
-
-            cfg = {}
-            cfg[SIG_ON] = sig_on
-            cfg[NARROW_LPF] = (lpf_narrow == 1)
-            cfg[NARROW_HPF] = (hpf_narrow == 1)
-            cfg[FIRST_ATTEN] = first_atten
-            cfg[SECOND_ATTEN] = second_atten
-            cfg[DC_ON] = dc_on
-            rtn.append(cfg)
-
-        return rtn
-
-    def _get_hpf(self, chan_cfg: int) -> int:
-        return chan_cfg & 0x01
+        decode = self._decode_cfg
+        return [decode(chan_cfg) for chan_cfg in chan_cfgs]
 
-    def _get_lpf(self, chan_cfg: int) -> int:
-        return (chan_cfg & (1 << 2)) >> 2
+    def _decode_cfg(self, chan_cfg: int) -> dict:
+        """Helper to decode a 16 bit channel configuration word.
 
-    def _is_sig_on(self, chan_cfg: int) -> bool:
-        hpf = self._get_hpf(chan_cfg)
-        so = (chan_cfg & (1 << 1)) >> 1
-        return so == hpf
+        Note
+        ----
+        Inverse of _encode_cfg(). Done inline rather than through the
+        _get_*() accessors since it runs for every channel of every poll.
 
-    def _get_first_atten(self, chan_cfg: int) -> int:
-        return ((chan_cfg ^ 0xffff) & 0x01f8) >> 3
+        Args
+        ----
+        chan_cfg
+           16 bit channel configuration word.
 
-    def _get_second_atten(self, chan_cfg: int) -> int:
-        return ((chan_cfg ^ 0xffff) & 0x7f00) >> 9
+        Returns
+        -------
+        dict
+           Channel configuration dictionary. See get_chan_cfg().
 
-    def _is_dc_on(self, chan_cfg: int) -> bool:
-        dc_on = (chan_cfg & 0x8000) >> 15
-        return dc_on == 1
+        """
+        inv = chan_cfg ^ 0xFFFF
+        return {
+            SIG_ON: ((chan_cfg >> 1) & 1) == (chan_cfg & 1),
+            NARROW_LPF: (chan_cfg & 0x04) != 0,
+            NARROW_HPF: (chan_cfg & 0x01) != 0,
+            FIRST_ATTEN: ((inv & FIRST_ATTEN_MASK) >> FIRST_ATTEN_START_BIT)
+            * ATTEN_SCALE,
+            SECOND_ATTEN: ((inv & SECOND_ATTEN_MASK) >> SECOND_ATTEN_START_BIT)
+            * ATTEN_SCALE,
+            DC_ON: (chan_cfg & 0x8000) != 0
+        }
 
     def _get_chan_cfg(self,
                       arx_addr: int,
@@ -1003,11 +1587,10 @@ class ARX:
 
         self._check_channel(chan)
 
-        chan_str = "{:1X}".format(chan)
-        rtn = self._send(arx_addr, 'getc', chan_str, user_timeout)
-
-        self._check_rtn(rtn, SET_CHAN_CFG_ERRORS)
-        return rtn['chan_config'][0]
+        chan_str = CHAN_HEX1[chan]
+        rtn = self._cmd(arx_addr, 'getc', chan_str, 'chan_config',
+                        SET_CHAN_CFG_ERRORS, user_timeout=user_timeout)
+        return rtn[0]
 
     def _get_all_chan_cfg(self,
                           arx_addr: int,
@@ -1039,10 +1622,8 @@ class ARX:
 
         """
 
-        rtn = self._send(arx_addr, 'geta', '', user_timeout)
-
-        self._check_rtn(rtn, SET_CHAN_CFG_ERRORS)
-        return rtn['chan_config']
+        return self._cmd(arx_addr, 'geta', '', 'chan_config',
+                         SET_CHAN_CFG_ERRORS, user_timeout=user_timeout)
     
     def set_all_chan_cfg(self,
                          arx_addr: int,
@@ -1118,10 +1699,12 @@ class ARX:
 
         """
 
-        chan_cfg_str = "{:04X}".format(self.chan_cfg[chan])
+        chan_cfg_str = _cfg_hex(self.chan_cfg[chan])
         rtn = self._send(arx_addr, 'seta', chan_cfg_str, user_timeout)
 
-        return self._check_rtn(rtn, SET_ALL_CHAN_CFG_ERRORS)
+        rtn = self._check_rtn(rtn, SET_ALL_CHAN_CFG_ERRORS)
+        self._dirty.discard(chan)
+        return rtn
 
     def set_all_different_chan_cfg(self,
                                    arx_addr,
@@ -1129,6 +1712,12 @@ class ARX:
                                    user_timeout: int = USER_TIMEOUT):
         """Sends configurations defined in chan_cfgs for each channel to the ARX board. 
 
+        Note
+        ----
+        All channels are configured with a single 'sets' command, so use this
+        instead of calling set_chan_cfg() once per channel. The board requires
+        exactly MAX_CHAN configurations (64 hex characters).
+
         Args
         ----
         arx_addr
@@ -1157,30 +1746,147 @@ class ARX:
         set_all_different_chan_cfg()
 
         """
-        [
-            self._set_local_chan_cfg(chan, cfg)
-            for chan, cfg in enumerate(chan_cfgs)
-        ]
+        self._pack_chan_cfgs(chan_cfgs)
         self._set_all_different_chan_cfg(arx_addr, user_timeout)
 
-    def _set_all_different_chan_cfg(self,
-                                    arx_addr,
-                                    user_timeout: int = USER_TIMEOUT):
-        """Sends all configurations defined for each channel to the ARX board.
+    def compile_template(self, chan_cfg):
+        """Return a function that sends a fixed configuration to a board.
+
+        >>> apply = my_arx.compile_template(chan_cfg)
+        >>> for arx_addr in arx_addrs:
+        ...     apply(arx_addr)
 
         Note
         ----
-        Sends the internal channel configurations to the ARX board.
-        Each channel can have a different configuration.
-        Changing the internal configuration can be done using the other
-        `set_chan_cfg_` functions.
+        The configuration is validated and encoded once. The returned
+        function only sends the precomputed 'seta' or 'sets' payload, the
+        same one set_all_chan_cfg() or set_all_different_chan_cfg() sends, so
+        applying the same template to many boards skips the encoding. The
+        local configuration is not changed.
 
         Args
         ----
-        arx_addr
-           ARX board address.
-        user_timeout
-            User specified timeout on command. Defaults to 500ms
+        chan_cfg
+           A configuration dictionary for all channels, see
+           set_all_chan_cfg(), or a list of MAX_CHAN configuration
+           dictionaries ordered by channel, see set_all_different_chan_cfg().
+
+        Returns
+        -------
+        function
+           apply(arx_addr, user_timeout=USER_TIMEOUT) returning an empty
+           string for no errors and raising ArxException otherwise.
+
+        Raises
+        ------
+        ArxException
+           Invalid configuration.
+
+        """
+        if isinstance(chan_cfg, dict):
+            cmd = 'seta'
+            payload = _cfg_hex(self._encode_cfg(chan_cfg))
+            errors = SET_ALL_CHAN_CFG_ERRORS
+        else:
+            if len(chan_cfg) != MAX_CHAN:
+                raise ARXE.ArxException(
+                    "Expected {} channel configurations. Got {}".format(
+                        MAX_CHAN, len(chan_cfg)))
+            cmd, payload, errors = _all_chan_cfg_cmd(
+                [self._encode_cfg(cfg) for cfg in chan_cfg])
+
+        def apply(arx_addr: int, user_timeout: int = USER_TIMEOUT) -> str:
+            rtn = self._send(arx_addr, cmd, payload, user_timeout)
+            return self._check_rtn(rtn, errors)
+
+        return apply
+
+    def _pack_chan_cfgs(self, chan_cfgs: list):
+        """Helper to replace the local configuration of every channel.
+
+        Note
+        ----
+        All configurations are encoded before anything is stored, so an
+        invalid entry leaves the local configuration untouched.
+
+        Args
+        ----
+        chan_cfgs
+           list of MAX_CHAN configuration dictionaries ordered by channel.
+
+        Raises
+        ------
+        ArxException
+           Wrong number of configurations or an invalid configuration.
+
+        """
+        if len(chan_cfgs) != MAX_CHAN:
+            raise ARXE.ArxException(
+                "Expected {} channel configurations. Got {}".format(
+                    MAX_CHAN, len(chan_cfgs)))
+        words = array.array('H', map(self._encode_cfg, chan_cfgs))
+        self.chan_cfg = words
+        self.chan_cfg_signal_on = [cfg[SIG_ON] for cfg in chan_cfgs]
+        self._dirty.update(range(MAX_CHAN))
+
+    @contextlib.contextmanager
+    def staged(self,
+               arx_addr: int,
+               user_timeout: int = USER_TIMEOUT):
+        """Context manager to change several channels with one command.
+
+        >>> with my_arx.staged(brd_addr) as cfgs:
+        >>>     cfgs[0]['first_atten'] = 3.5
+        >>>     cfgs[5]['sig_on'] = False
+
+        Note
+        ----
+        Yields the board's current channel configurations, read with a
+        single 'geta'. Changes made to them are sent with one 'sets' when
+        the block exits. Nothing is sent if the block raises.
+
+        Args
+        ----
+        arx_addr
+           ARX board address.
+        user_timeout
+            User specified timeout on each command. Defaults to 500ms
+
+        Raises
+        ------
+        ArxException
+           Any ARX errors.
+
+        See Also
+        --------
+        get_all_chan_cfg()
+        set_all_different_chan_cfg()
+
+        """
+
+        chan_cfgs = self.get_all_chan_cfg(arx_addr, user_timeout)
+        yield chan_cfgs
+        self.set_all_different_chan_cfg(arx_addr, chan_cfgs, user_timeout)
+
+    def _set_all_different_chan_cfg(self,
+                                    arx_addr,
+                                    user_timeout: int = USER_TIMEOUT):
+        """Sends all configurations defined for each channel to the ARX board.
+
+        Note
+        ----
+        Sends the internal channel configurations to the ARX board.
+        Each channel can have a different configuration.
+        Changing the internal configuration can be done using the other
+        `set_chan_cfg_` functions. If all channels have the same
+        configuration, the shorter 'seta' command is sent instead.
+
+        Args
+        ----
+        arx_addr
+           ARX board address.
+        user_timeout
+            User specified timeout on command. Defaults to 500ms
 
         Raises
         ------
@@ -1191,14 +1897,264 @@ class ARX:
         --------
         set_chan_cfg()
         set_all_chan_cfg()
-        set_all_differentchan_cfg()
+        set_all_different_chan_cfg()
 
         """
 
-        chan_cfg_str = ''.join("{:04X}".format(x) for x in self.chan_cfg)
-        rtn = self._send(arx_addr, 'sets', chan_cfg_str, user_timeout)
+        cmd, chan_cfg_str, errors = _all_chan_cfg_cmd(self.chan_cfg)
+        rtn = self._send(arx_addr, cmd, chan_cfg_str, user_timeout)
+
+        rtn = self._check_rtn(rtn, errors)
+        self._dirty.clear()
+        return rtn
+
+    def flush_chan_cfg(self,
+                       arx_addr: int,
+                       user_timeout: int = USER_TIMEOUT):
+        """Sends the locally changed channel configurations to the ARX board.
+
+        Note
+        ----
+        Only changed channels are sent, each with its own 'setc'. The
+        commands are sent together, so any number of them costs about one
+        round trip. When every channel changed, one 'sets' (or 'seta') is
+        sent instead. Channels whose 'setc' failed stay changed so a later
+        flush retries them.
 
-        return self._check_rtn(rtn, SET_ALL_DIFFERENT_CHAN_CFG_ERRORS)
+        Args
+        ----
+        arx_addr
+           ARX board address.
+        user_timeout
+            User specified timeout on command. Defaults to 500ms
+
+        Returns
+        -------
+        str
+           Empty string for no errors.
+
+        Raises
+        ------
+        ArxException
+           Any ARX errors.
+
+        See Also
+        --------
+        set_chan_cfg()
+        set_all_different_chan_cfg()
+
+        """
+        if not self._dirty:
+            return ""
+        if len(self._dirty) == 1:
+            chan = next(iter(self._dirty))
+            return self._set_chan_cfg(arx_addr, chan, user_timeout)
+        if len(self._dirty) == MAX_CHAN:
+            return self._set_all_different_chan_cfg(arx_addr, user_timeout)
+
+        chans = sorted(self._dirty)
+        rtns = self._send_batch(
+            arx_addr, [('setc', CHAN_CFG_FMT % (chan, self.chan_cfg[chan]))
+                       for chan in chans], user_timeout)
+        failed = None
+        for chan, rtn in zip(chans, rtns):
+            if rtn['err_str'] == "":
+                self._dirty.discard(chan)
+            elif failed is None:
+                failed = rtn
+        if failed is not None:
+            self._check_rtn(failed, SET_CHAN_CFG_ERRORS)
+        return ""
+
+    def _set_all_atten(self, vals: list, mask: int, start_bit: int):
+        """Helper to set one attenuation of every channel.
+
+        Args
+        ----
+        vals
+           MAX_CHAN attenuation values in units of 0.5db ordered by channel.
+        mask
+           Mask of the attenuation bits.
+        start_bit
+           Lowest attenuation bit.
+
+        Raises
+        ------
+        ArxException
+           Wrong number of values or a value out of range.
+
+        """
+        if len(vals) != MAX_CHAN:
+            raise ARXE.ArxException(
+                "Expected {} attenuation values. Got {}".format(
+                    MAX_CHAN, len(vals)))
+        for val in vals:
+            if val < MIN_ATTENUATION or val > MAX_ATTENUATION:
+                raise ARXE.ArxException(
+                    "Invalid atten setting: {}".format(val))
+        self.chan_cfg = array.array('H', (
+            self._get_atten(val, mask, start_bit, word)
+            for val, word in zip(vals, self.chan_cfg)))
+        self._dirty.update(range(MAX_CHAN))
+
+    def _set_all_bit(self, bit: int, val: bool):
+        """Helper to set or clear one bit of every channel.
+
+        Args
+        ----
+        bit
+           Bit number in the channel configuration.
+        val
+           True to set the bit, False to clear it.
+
+        """
+        mask = 1 << bit
+        if val:
+            words = (word | mask for word in self.chan_cfg)
+        else:
+            words = (word & ~mask for word in self.chan_cfg)
+        self.chan_cfg = array.array('H', words)
+        self._dirty.update(range(MAX_CHAN))
+
+    def _set_all_signal_bits(self):
+        """Helper to set every channel's signal bit from its signal on state.
+        """
+        self.chan_cfg = array.array('H', (
+            (word & ~2) | (SIG_BIT[(word & 1, bool(on))] << 1)
+            for word, on in zip(self.chan_cfg, self.chan_cfg_signal_on)))
+        self._dirty.update(range(MAX_CHAN))
+
+    def set_all_first_atten(self, vals: list):
+        """Set the first attenuation of every channel.
+
+        Note
+        ----
+        This function only manipulates the local configuration.
+        Use flush_chan_cfg() to send to ARX board.
+
+        Args
+        ----
+        vals
+           MAX_CHAN attenuation values in units of 0.5db ordered by channel.
+
+        Raises
+        ------
+        ArxException
+           Wrong number of values or a value out of range.
+
+        See Also
+        --------
+        flush_chan_cfg()
+
+        """
+        self._set_all_atten(vals, FIRST_ATTEN_MASK, FIRST_ATTEN_START_BIT)
+
+    def set_all_second_atten(self, vals: list):
+        """Set the second attenuation of every channel.
+
+        Note
+        ----
+        This function only manipulates the local configuration.
+        Use flush_chan_cfg() to send to ARX board.
+
+        Args
+        ----
+        vals
+           MAX_CHAN attenuation values in units of 0.5db ordered by channel.
+
+        Raises
+        ------
+        ArxException
+           Wrong number of values or a value out of range.
+
+        See Also
+        --------
+        flush_chan_cfg()
+
+        """
+        self._set_all_atten(vals, SECOND_ATTEN_MASK, SECOND_ATTEN_START_BIT)
+
+    def set_all_narrow_hpf(self, narrow: bool = True):
+        """Set the highpass filter of every channel.
+
+        Note
+        ----
+        This function only manipulates the local configuration.
+        Use flush_chan_cfg() to send to ARX board.
+
+        Args
+        ----
+        narrow
+           True for narrow filter. False for wide filter.
+
+        See Also
+        --------
+        flush_chan_cfg()
+
+        """
+        self._set_all_bit(0, narrow)
+        self._set_all_signal_bits()
+
+    def set_all_narrow_lpf(self, narrow: bool = True):
+        """Set the lowpass filter of every channel.
+
+        Note
+        ----
+        This function only manipulates the local configuration.
+        Use flush_chan_cfg() to send to ARX board.
+
+        Args
+        ----
+        narrow
+           True for narrow filter. False for wide filter.
+
+        See Also
+        --------
+        flush_chan_cfg()
+
+        """
+        self._set_all_bit(2, narrow)
+
+    def set_all_sig_on(self, on: bool = True):
+        """Turn the signal of every channel on or off.
+
+        Note
+        ----
+        This function only manipulates the local configuration.
+        Use flush_chan_cfg() to send to ARX board.
+
+        Args
+        ----
+        on
+           True to turn signal on, False to turn it off.
+
+        See Also
+        --------
+        flush_chan_cfg()
+
+        """
+        self.chan_cfg_signal_on = MAX_CHAN * [on]
+        self._set_all_signal_bits()
+
+    def set_all_dc_on(self, on: bool = True):
+        """Turn the input DC power of every channel on or off.
+
+        Note
+        ----
+        This function only manipulates the local configuration.
+        Use flush_chan_cfg() to send to ARX board.
+
+        Args
+        ----
+        on
+           True to turn DC on, False to turn it off.
+
+        See Also
+        --------
+        flush_chan_cfg()
+
+        """
+        self._set_all_bit(15, on)
 
     def get_board_sn(self,
                      arx_addr: int,
@@ -1225,12 +2181,7 @@ class ARX:
 
         """
 
-        if self.brd_sn != None:
-            return self.brd_sn
-        else:
-            brd_dict = self.get_board_info(arx_addr,
-                                           user_timeout)
-            return self.brd_sn
+        return self._cached_board_info(arx_addr, user_timeout)['brd_sn']
 
     def get_board_info(self,
                      arx_addr: int,
@@ -1243,6 +2194,13 @@ class ARX:
            index represents the channel index. A vaule 0 represents a coax
            coupled antenna and a 1 represents a fiber coupled antenna.
 
+        Note
+        ----
+        The board is always queried. The reply also refreshes the board
+        info cached for get_board_sn(), get_firmware_version() and the
+        channel current getters, which query a board only once. See
+        refresh_board_info().
+
         Args
         ----
         arx_addr
@@ -1264,21 +2222,326 @@ class ARX:
 
         """
 
-        rtn = self._send(arx_addr, 'arxn', '',user_timeout)
-        self._check_rtn(rtn)
-        self.brd_sn = rtn['brd_id']
-        self.sw_ver = rtn['sw_ver']
-        self.input_coupling = rtn['input_coupling']
-        self.onewire_temp_count = rtn['1wire_temp_count']
-        self.onewire_temp_chan_map = rtn['1wire_temp_chan_map']
-        rtn_d = {}
-        rtn_d['brd_sn'] = self.brd_sn
-        rtn_d['sw_ver'] = self.sw_ver
-        rtn_d['input_coupling'] = self.input_coupling
-        rtn_d['1wire_temp_count'] = self.onewire_temp_count
-        rtn_d['1wire_temp_chan_map'] = self.onewire_temp_chan_map
-        return rtn_d
+        # bypass a reply cached by a cache_ttl
+        with self._cache_lock:
+            self._cache.pop((arx_addr, 'arxn', ''), None)
+        rtn = self._cmd(arx_addr, 'arxn', '', None, user_timeout=user_timeout)
+        return dict(self._store_board_info(arx_addr, rtn))
+
+    def _cached_board_info(self,
+                           arx_addr: int,
+                           user_timeout: int = USER_TIMEOUT) -> dict:
+        """Helper returning the board info of arx_addr, querying it only once.
+
+        Note
+        ----
+        Board info does not change while a board is running, so the first
+        'arxn' reply for each board is reused. See refresh_board_info().
+        The returned dictionary is the cached one and must not be changed.
+
+        """
+        brd_info = self._board_info.get(arx_addr)
+        if brd_info is not None:
+            return brd_info
+
+        rtn = self._cmd(arx_addr, 'arxn', '', None, user_timeout=user_timeout)
+        return self._store_board_info(arx_addr, rtn)
+
+    def _store_board_info(self, arx_addr: int, rtn: dict) -> dict:
+        """Helper to cache the board info in an 'arxn' reply.
+        """
+        brd_info = {'brd_sn': rtn['brd_id']}
+        brd_info.update((key, rtn[key]) for key in BOARD_INFO_KEYS)
+        self._board_info[arx_addr] = brd_info
+        (self.brd_sn, self.sw_ver, self.input_coupling,
+         self.onewire_temp_count, self.onewire_temp_chan_map) = (
+             brd_info['brd_sn'], brd_info['sw_ver'],
+             brd_info['input_coupling'], brd_info['1wire_temp_count'],
+             brd_info['1wire_temp_chan_map'])
+        return brd_info
+
+    def refresh_board_info(self, arx_addr: int = None):
+        """Forget cached board info so the next getter queries the board.
+
+        Note
+        ----
+        Also forgets cached 1-wire serial numbers and cached command
+        responses. Use after a board or a 1-wire device was swapped.
+
+        Args
+        ----
+        arx_addr
+            Optional ARX board address. Defaults to None for all boards.
+
+        """
+        if arx_addr is None:
+            self._board_info = {}
+            self._onewire_sn = {}
+        else:
+            self._board_info.pop(arx_addr, None)
+            self._forget_1wire_sn(arx_addr)
+        self.invalidate_cache(arx_addr)
+
+    def _forget_1wire_sn(self, arx_addr: int):
+        for key in [key for key in self._onewire_sn if key[0] == arx_addr]:
+            del self._onewire_sn[key]
                        
+    def scan_boards(self,
+                    arx_addrs: list = None,
+                    user_timeout: int = USER_TIMEOUT) -> dict:
+        """Probe several ARX boards at once and report which respond.
+
+        Note
+        ----
+        Board info is produced on demand by the ARX service rather than
+        stored in etcd, so every board still has to be asked. The requests
+        are written back-to-back with CmdRsp.send_many() and the timeout is
+        paid once for the whole scan instead of once per offline board.
+
+        Args
+        ----
+        arx_addrs
+            Optional list of ARX board addresses. Defaults to every valid
+            address.
+        user_timeout
+            User specified timeout for the whole scan.
+
+        Returns
+        -------
+        dict
+            Board address -> True if the board answered without error.
+
+        Raises
+        ------
+        ArxException
+           If an address is out of range.
+
+        """
+
+        if arx_addrs is None:
+            arx_addrs = range(MIN_BRD_ADDR, MAX_BRD_ADDR + 1)
+        rtns = self._send_all(arx_addrs, 'arxn', '', user_timeout)
+
+        return {arx_addr: rtn is not None and rtn.get('err_str') == ''
+                for arx_addr, rtn in rtns.items()}
+
+    def poll_boards(self,
+                    arx_addrs: list,
+                    cmd: str,
+                    val: str = '',
+                    user_timeout: int = USER_TIMEOUT) -> dict:
+        """Send one ARX command to several boards in parallel.
+
+        >>> temps = my_arx.poll_boards([17, 21, 27], 'temp')
+        >>> {addr: rtn['brd_temp'] for addr, rtn in temps.items() if rtn}
+
+        Note
+        ----
+        The commands are written back-to-back and all responses are awaited
+        together, so polling N boards takes about as long as polling the
+        slowest one. Error replies are returned, not raised. Check
+        'err_str' in each response.
+
+        Args
+        ----
+        arx_addrs
+            ARX board addresses
+        cmd
+            An ARX board command.
+        val
+            Args if any for ARX command
+        user_timeout
+            User specified timeout for the whole poll.
+
+        Returns
+        -------
+        dict
+            Board address -> response dictionary, or None if the board did
+            not respond.
+
+        Raises
+        ------
+        ArxException
+           Invalid board address.
+
+        See Also
+        --------
+        scan_boards()
+
+        """
+
+        return self._send_all(arx_addrs, cmd, val, user_timeout)
+
+    def _poll_values(self,
+                     arx_addrs: list,
+                     cmd: str,
+                     key: str = None,
+                     user_timeout: int = USER_TIMEOUT) -> dict:
+        """Helper to send cmd to several boards and pick key from each reply.
+
+        Returns
+        -------
+        dict
+            Board address -> response value, or the response dictionary if
+            key is None. None if the board did not respond or returned an
+            error.
+
+        """
+        rtns = self._send_all(arx_addrs, cmd, '', user_timeout)
+        return {arx_addr: (rtn[key] if key else rtn)
+                if rtn is not None and rtn.get('err_str') == '' else None
+                for arx_addr, rtn in rtns.items()}
+
+    def get_microcontroller_temp_many(self,
+                                      arx_addrs: list,
+                                      user_timeout: int = USER_TIMEOUT) -> dict:
+        """Return the microcontroller temperature of several boards.
+           See: get_microcontroller_temp() for details.
+
+        Note
+        ----
+        All boards are polled at once, see poll_boards().
+
+        Args
+        ----
+        arx_addrs
+            ARX board addresses
+        user_timeout
+            User specified timeout for the whole poll.
+
+        Returns
+        -------
+        dict
+            Board address -> temperature in degrees C, or None if the board
+            did not respond or returned an error.
+
+        Raises
+        ------
+        ArxException
+           Invalid board address.
+
+        """
+        return self._poll_values(arx_addrs, 'temp', 'brd_temp', user_timeout)
+
+    def get_1wire_temp_many(self,
+                            arx_addrs: list,
+                            user_timeout: int = ONEWIRE_TEMP_TIMEOUT) -> dict:
+        """Return the 1wire temperatures of several boards.
+           See: get_1wire_temp() for details.
+
+        Note
+        ----
+        All boards are polled at once, see poll_boards(), so the sensor
+        conversions on the boards overlap and the poll takes about as long
+        as one get_1wire_temp().
+
+        Args
+        ----
+        arx_addrs
+            ARX board addresses
+        user_timeout
+            User specified timeout for the whole poll. Defaults to 1.2sec
+
+        Returns
+        -------
+        dict
+            Board address -> list of 1wire device temperatures in C, or None
+            if the board did not respond or returned an error.
+
+        Raises
+        ------
+        ArxException
+           Invalid board address.
+
+        """
+        return self._poll_values(arx_addrs, 'owte', '1wire_temp',
+                                 user_timeout)
+
+    def get_all_chan_power_many(self,
+                                arx_addrs: list,
+                                user_timeout: int = USER_TIMEOUT) -> dict:
+        """Return all channel powers of several boards.
+           See: get_all_chan_power() for details.
+
+        Note
+        ----
+        All boards are polled at once, see poll_boards().
+
+        Args
+        ----
+        arx_addrs
+            ARX board addresses
+        user_timeout
+            User specified timeout for the whole poll.
+
+        Returns
+        -------
+        dict
+            Board address -> list of channel powers in Watts, or None if
+            the board did not respond or returned an error.
+
+        Raises
+        ------
+        ArxException
+           Invalid board address.
+
+        """
+        pwrs = self._poll_values(arx_addrs, 'powa', 'chan_microwatts',
+                                 user_timeout)
+        return {arx_addr: None if pwr is None else
+                [p * WATTS_PER_MICROWATT for p in pwr]
+                for arx_addr, pwr in pwrs.items()}
+
+    def get_all_chan_current_many(self,
+                                  arx_addrs: list,
+                                  user_timeout: int = USER_TIMEOUT) -> dict:
+        """Return all channel currents of several boards.
+           See: get_all_chan_current() for details.
+
+        Note
+        ----
+        All boards are polled at once, see poll_boards(). Boards whose
+        board info is not cached yet are asked for it in one more poll.
+
+        Args
+        ----
+        arx_addrs
+            ARX board addresses
+        user_timeout
+            User specified timeout for each poll.
+
+        Returns
+        -------
+        dict
+            Board address -> list of channel currents in Amps, or None if
+            the board did not respond or returned an error.
+
+        Raises
+        ------
+        ArxException
+           Invalid board address.
+
+        """
+        adcs = self._poll_values(arx_addrs, 'cura', 'chan_current_adc',
+                                 user_timeout)
+        missing = [arx_addr for arx_addr, adc in adcs.items()
+                   if adc is not None and arx_addr not in self._board_info]
+        if missing:
+            for arx_addr, rtn in self._poll_values(
+                    missing, 'arxn', None, user_timeout).items():
+                if rtn is not None:
+                    self._store_board_info(arx_addr, rtn)
+
+        amps = {}
+        for arx_addr, adc in adcs.items():
+            brd_info = self._board_info.get(arx_addr)
+            if adc is None or brd_info is None:
+                amps[arx_addr] = None
+            else:
+                amps[arx_addr] = self._adc2amps(adc,
+                                                brd_info['input_coupling'])
+        return amps
+
     def get_board_id(self,
                      arx_addr: int,
                      user_timeout: int = USER_TIMEOUT) -> int:
@@ -1305,6 +2568,10 @@ class ARX:
 
         """
 
+        if not ARX._board_id_warned:
+            ARX._board_id_warned = True
+            warnings.warn("get_board_id() is deprecated, use get_board_sn()",
+                          DeprecationWarning, stacklevel=2)
         return self.get_board_sn(arx_addr, user_timeout)
 
     def get_firmware_version(self,
@@ -1331,12 +2598,7 @@ class ARX:
 
         """
 
-        if self.sw_ver is not None:
-            return self.sw_ver
-        else:
-            brd_dict = self.get_board_info(arx_addr,
-                                           user_timeout)
-            return self.sw_ver
+        return self._cached_board_info(arx_addr, user_timeout)['sw_ver']
 
     def get_microcontroller_temp(self,
                                  arx_addr: int,
@@ -1362,9 +2624,8 @@ class ARX:
 
         """
 
-        rtn = self._send(arx_addr, 'temp', '',user_timeout)
-        self._check_rtn(rtn)
-        return rtn['brd_temp']
+        return self._cmd(arx_addr, 'temp', '', 'brd_temp',
+                         user_timeout=user_timeout)
 
     def echo(self,
              arx_addr: int,
@@ -1393,15 +2654,14 @@ class ARX:
 
         """
 
-        rtn = self._send(arx_addr, 'echo', val, user_timeout)
-        self._check_rtn(rtn)
-        rtn2 = rtn['echo']
-        e_val = rtn2.split("ECHO")[1]
+        rtn = self._cmd(arx_addr, 'echo', val, 'echo',
+                        user_timeout=user_timeout)
+        e_val = rtn.partition("ECHO")[2]
         if e_val != str(val):
             raise ARXE.ArxException(
                 "Echo return do not match sent. Sent= {}, return= {}".format(
                     val, e_val))
-        return rtn['echo']
+        return rtn
 
     def raw(self, arx_addr: int, cmd: str, user_timeout: int = RAW_USER_TIMEOUT) -> str:
         """Return byte stream for given command as Python 2 str type of hex digits. Each pair of digits represents the byte value in hex format.
@@ -1420,9 +2680,8 @@ class ARX:
 
         """
 
-        rtn = self._send(arx_addr, 'raw', cmd, user_timeout)
-        self._check_rtn(rtn)
-        return rtn['raw']
+        return self._cmd(arx_addr, 'raw', cmd, 'raw',
+                         user_timeout=user_timeout)
 
     def _get_time(self,
                   arx_addr: int,
@@ -1448,9 +2707,8 @@ class ARX:
 
         """
 
-        rtn = self._send(arx_addr, 'gtim', '',user_timeout)
-        self._check_rtn(rtn)
-        return rtn['brd_time_sec']
+        return self._cmd(arx_addr, 'gtim', '', 'brd_time_sec',
+                         user_timeout=user_timeout)
 
     def _set_time(self,
                   arx_addr: int,
@@ -1479,12 +2737,63 @@ class ARX:
 
         """
 
-        self._check_time(time)
+        self._check_time(time0)
+
+        time_str = "{:08X}".format(time0)
+        return self._cmd(arx_addr, 'stim', time_str, 'err_str',
+                         user_timeout=user_timeout)
+
+    def set_time_all(self,
+                     time0: int,
+                     arx_addrs: list,
+                     user_timeout: int = USER_TIMEOUT) -> str:
+        """Set the same board time in seconds on several boards.
+
+        Note
+        ----
+        All boards are sent the time back-to-back and their responses
+        awaited together, so they are set within one round trip of each
+        other instead of one after another.
+
+        Args
+        ----
+        time0
+            Represents time in seconds.
+        arx_addrs
+            ARX board addresses.
+        user_timeout
+            User specified timeout for the whole batch.
 
-        time_str = "{}".format(time0)
-        rtn = self._send(arx_addr, 'gtim', time_str, user_timeout)
-        self._check_rtn(rtn)
-        return rtn['err_str']
+        Returns
+        -------
+        str
+           Empty string for no errors.
+
+        Raises
+        ------
+        ArxException
+           Lists every board that did not respond or returned an error.
+
+        """
+
+        self._check_time(time0)
+
+        time_str = "{:08X}".format(time0)
+        rtns = self._send_all(arx_addrs, 'stim', time_str, user_timeout)
+
+        errs = []
+        for arx_addr, rtn in rtns.items():
+            if rtn is None:
+                errs.append("{}: no response".format(arx_addr))
+                continue
+            try:
+                self._check_rtn(rtn)
+            except ARXE.ArxException as exc:
+                errs.append("{}: {}".format(arx_addr, exc))
+        if errs:
+            raise ARXE.ArxException(
+                "Unable to set time. {}".format("; ".join(errs)))
+        return ""
 
     def get_chan_voltage(self,
                          arx_addr: int,
@@ -1520,12 +2829,10 @@ class ARX:
         """
 
         self._check_channel(chan)
-        chan_str = "{:02X}".format(chan)
-        rtn = self._send(arx_addr, 'anlg', chan_str, user_timeout)
-
-        self._check_rtn(rtn, ANLG_ERRORS)
-
-        return rtn['chan_adc_millivolts']/1000.
+        chan_str = CHAN_HEX2[chan]
+        rtn = self._cmd(arx_addr, 'anlg', chan_str, 'chan_adc_millivolts',
+                        ANLG_ERRORS, user_timeout=user_timeout)
+        return rtn/1000.
 
     def load_cfg(self,
                  arx_addr: int,
@@ -1559,7 +2866,7 @@ class ARX:
         """
 
         self._check_location(loc)
-        loc_str = "{}".format(loc)
+        loc_str = LOC_STR[loc]
 
         rtn = self._send(arx_addr, 'load', loc_str, user_timeout)
 
@@ -1598,7 +2905,7 @@ class ARX:
 
         self._check_location(loc)
 
-        loc_str = "{}".format(loc)
+        loc_str = LOC_STR[loc]
 
         rtn = self._send(arx_addr, 'save', loc_str, user_timeout)
 
@@ -1635,15 +2942,11 @@ class ARX:
 
         self._check_channel(chan)
 
-        chan_str = "{:1X}".format(chan)
-
-        rtn = self._send(arx_addr, 'powc', chan_str, user_timeout)
-        self._check_rtn(rtn)
+        chan_str = CHAN_HEX1[chan]
 
-        pwr_watts = []
-        for pwr in rtn['chan_microwatts']:
-            pwr_watts.append(pwr*1e-6)
-        return pwr_watts[0]
+        rtn = self._cmd(arx_addr, 'powc', chan_str, 'chan_microwatts',
+                        user_timeout=user_timeout)
+        return rtn[0] * WATTS_PER_MICROWATT
 
     def get_all_chan_power(self,
                            arx_addr: int,
@@ -1669,13 +2972,9 @@ class ARX:
             Any ARX error.
 
         """
-        rtn = self._send(arx_addr, 'powa', '',user_timeout)
-        self._check_rtn(rtn)
-        pwr_watts = []
-        for pwr in rtn['chan_microwatts']:
-            # convert to watts
-            pwr_watts.append(pwr*1e-6)
-        return pwr_watts
+        rtn = self._cmd(arx_addr, 'powa', '', 'chan_microwatts',
+                        user_timeout=user_timeout)
+        return [pwr * WATTS_PER_MICROWATT for pwr in rtn]
 
     def _get_chan_current_adc(self,
                               arx_addr: int,
@@ -1722,11 +3021,10 @@ class ARX:
         # this is the photodiode current at the ARX board; 4095 corresponds to
         # 5 mA.
 
-        chan_str = "{:1X}".format(chan)
-        rtn = self._send(arx_addr, 'curc', chan_str, user_timeout)
-        self._check_rtn(rtn)
-
-        return rtn['chan_current_adc'][0]
+        chan_str = CHAN_HEX1[chan]
+        rtn = self._cmd(arx_addr, 'curc', chan_str, 'chan_current_adc',
+                        user_timeout=user_timeout)
+        return rtn[0]
 
     def _adc2volts(self, adc: int) -> float:
         return adc * MVOLT_PER_COUNT / 1000.
@@ -1764,13 +3062,18 @@ class ARX:
             Any ARX error.
 
         """
+        if self.cache_ttl:
+            # Monitoring loops read every channel in turn. One cached 'cura'
+            # serves all of them instead of 16 'curc'.
+            return self.get_chan_current_batch(arx_addr, [chan],
+                                               user_timeout)[0]
         self._check_channel(chan)
         chan_adc = self._get_chan_current_adc(arx_addr, chan, user_timeout)
-        if self.input_coupling is None:
-            self.get_board_info(arx_addr, user_timeout)
+        coupling = self._cached_board_info(arx_addr,
+                                           user_timeout)['input_coupling']
         volts = self._adc2volts(chan_adc)
 
-        return self._volts2Amps(volts, self.input_coupling[chan])
+        return self._volts2Amps(volts, coupling[chan])
     
     def _get_all_chan_current_adc(self,
                              arx_addr: int,
@@ -1796,10 +3099,8 @@ class ARX:
             Any ARX error.
 
         """
-        rtn = self._send(arx_addr, 'cura', '',user_timeout)
-        self._check_rtn(rtn)
-
-        return rtn['chan_current_adc']
+        return self._cmd(arx_addr, 'cura', '', 'chan_current_adc',
+                         user_timeout=user_timeout)
 
     def get_all_chan_current(self,
                              arx_addr: int,
@@ -1826,13 +3127,50 @@ class ARX:
 
         """
         adc_list = self._get_all_chan_current_adc(arx_addr, user_timeout)
-        if self.input_coupling is None:
-            self.get_board_info(arx_addr, user_timeout)
-        current = []
-        for idx, adc in enumerate(adc_list):
-            volts = self._adc2volts(adc)
-            current.append(self._volts2Amps(volts, self.input_coupling[idx]))
-        return current
+        coupling = self._cached_board_info(arx_addr,
+                                           user_timeout)['input_coupling']
+        return self._adc2amps(adc_list, coupling)
+
+    def _adc2amps(self, adc_list: list, coupling: list) -> list:
+        return [adc * MVOLT_PER_COUNT / 1000. * MA_PER_VOLT[1 if cpl else 0]
+                / 1000. for adc, cpl in zip(adc_list, coupling)]
+
+    def get_chan_current_batch(self,
+                               arx_addr: int,
+                               chans: list,
+                               user_timeout: int = USER_TIMEOUT) -> list:
+        """Return the currents of several channels in Amps.
+           See: get_chan_current() for details.
+
+        Note
+        ----
+        Always reads all channels with a single 'cura' command, so any
+        number of channels costs one round trip.
+
+        Args
+        ----
+        arx_addr
+            ARX board address.
+        chans
+            Channel numbers. 0 indexed
+        user_timeout
+            User specified timeout on command. Defaults to 500ms
+
+        Returns
+        -------
+        list
+           Current for each requested channel in Amps.
+
+        Raises
+        ------
+        ArxException
+            Any ARX error.
+
+        """
+        for chan in chans:
+            self._check_channel(chan)
+        amps = self.get_all_chan_current(arx_addr, user_timeout)
+        return [amps[chan] for chan in chans]
 
     def get_board_current(self,
                           arx_addr: int,
@@ -1859,9 +3197,83 @@ class ARX:
             Any ARX error.
 
         """
-        rtn = self._send(arx_addr, 'curb', '', user_timeout)
-        self._check_rtn(rtn)
-        return rtn['brd_milliamps'] * 0.001
+        rtn = self._cmd(arx_addr, 'curb', '', 'brd_milliamps',
+                        user_timeout=user_timeout)
+        return rtn * 0.001
+
+    def get_all_telemetry(self,
+                          arx_addr: int,
+                          user_timeout: int = USER_TIMEOUT,
+                          onewire: bool = False) -> dict:
+        """Return the board's power, current and temperature readings.
+
+        Note
+        ----
+        The 'powa', 'cura', 'curb' and 'temp' commands, plus 'arxn' if the
+        board info is not cached yet and 'owte' if onewire is True, are
+        sent together, so a telemetry scrape costs about one round trip.
+
+        Args
+        ----
+        arx_addr
+            ARX board address.
+        user_timeout
+            User specified timeout for the whole batch. Raised to
+            ONEWIRE_TEMP_TIMEOUT if onewire is True.
+        onewire
+            Optional. True to also read the 1wire temperatures.
+
+        Returns
+        -------
+        dict
+           A dictionary with the following keys:
+           'chan_power': list of channel powers in Watts.
+           'chan_current': list of channel currents in Amps.
+           'brd_current': ARX board current in Amps.
+           'brd_temp': microcontroller temperature in C.
+           'onewire_temp': list of 1wire device temperatures in C. Only
+           present if onewire is True.
+
+        Raises
+        ------
+        ArxException
+            Any ARX error.
+
+        See Also
+        --------
+        get_all_chan_power()
+        get_all_chan_current()
+        get_board_current()
+        get_microcontroller_temp()
+        get_1wire_temp()
+
+        """
+        cmds = [('powa', ''), ('cura', ''), ('curb', ''), ('temp', '')]
+        brd_info = self._board_info.get(arx_addr)
+        if brd_info is None:
+            cmds.append(('arxn', ''))
+        if onewire:
+            cmds.append(('owte', ''))
+            user_timeout = max(user_timeout, ONEWIRE_TEMP_TIMEOUT)
+        rtns = dict(zip((cmd for cmd, _ in cmds),
+                        self._send_batch(arx_addr, cmds, user_timeout)))
+        for cmd, rtn in rtns.items():
+            self._check_rtn(rtn,
+                            ONEWIRE_TEMP_ERRORS if cmd == 'owte' else None)
+        if brd_info is None:
+            brd_info = self._store_board_info(arx_addr, rtns['arxn'])
+
+        telemetry = {
+            'chan_power': [pwr * WATTS_PER_MICROWATT
+                           for pwr in rtns['powa']['chan_microwatts']],
+            'chan_current': self._adc2amps(rtns['cura']['chan_current_adc'],
+                                           brd_info['input_coupling']),
+            'brd_current': rtns['curb']['brd_milliamps'] * 0.001,
+            'brd_temp': rtns['temp']['brd_temp'],
+        }
+        if onewire:
+            telemetry['onewire_temp'] = rtns['owte']['1wire_temp']
+        return telemetry
 
     def _search_1wire(self,
                       arx_addr: int,
@@ -1886,10 +3298,10 @@ class ARX:
             Any ARX error.
 
         """
-        rtn = self._send(arx_addr, 'owse', '',user_timeout)
-
-        self._check_rtn(rtn, ONEWIRE_SEARCH_ERRORS)
-        return rtn['1wire_dev_count']
+        # a search may number the devices differently
+        self._forget_1wire_sn(arx_addr)
+        return self._cmd(arx_addr, 'owse', '', '1wire_dev_count',
+                         ONEWIRE_SEARCH_ERRORS, user_timeout=user_timeout)
 
     def get_1wire_count(self,
                         arx_addr: int,
@@ -1920,10 +3332,8 @@ class ARX:
 
         """
 
-        rtn = self._send(arx_addr, 'owdc', '',user_timeout)
-        self._check_rtn(rtn)
-
-        return rtn['1wire_dev_count']
+        return self._cmd(arx_addr, 'owdc', '', '1wire_dev_count',
+                         user_timeout=user_timeout)
 
     def get_1wire_SN(self,
                       arx_addr: int,
@@ -1948,16 +3358,71 @@ class ARX:
         Raises
         ------
         ArxException
-            Any ARX error.
+            Any ARX error, or the serial number fails its CRC check.
 
         """
 
-        dev = '{:01X}'.format(dev_num)
-        rtn = self._send(arx_addr, 'owsn', dev, user_timeout)
+        # serial numbers are burned into the devices, ask only once
+        sn = self._onewire_sn.get((arx_addr, dev_num))
+        if sn is None:
+            dev = '{:01X}'.format(dev_num)
+            sn = self._cmd(arx_addr, 'owsn', dev, '1wire_sn',
+                           ONEWIRE_SERIAL_NUMBER_ERRORS,
+                           user_timeout=user_timeout)
+            _check_1wire_sn(sn)
+            self._onewire_sn[(arx_addr, dev_num)] = sn
+        return sn
+
+    def get_all_1wire_SN(self,
+                         arx_addr: int,
+                         user_timeout: int = USER_TIMEOUT) -> list:
+        """Return the serial numbers of all 1wire devices.
 
-        self._check_rtn(rtn, ONEWIRE_SERIAL_NUMBER_ERRORS)
-        return rtn['1wire_sn']
+        Note
+        ----
+        The 'owsn' commands for devices whose serial number is not cached
+        yet are sent together, so the whole enumeration costs about two
+        round trips. The serial numbers are cached like get_1wire_SN().
 
+        Args
+        ----
+        arx_addr
+            ARX board address.
+        user_timeout
+            User specified timeout on each command batch. Defaults to 500ms
+
+        Returns
+        -------
+        list
+           Serial numbers as 16 char hex strings, in order of the
+           device's index number.
+
+        Raises
+        ------
+        ArxException
+            Any ARX error, or a serial number fails its CRC check.
+
+        See Also
+        --------
+        get_1wire_count()
+        get_1wire_SN()
+
+        """
+
+        count = self.get_1wire_count(arx_addr, user_timeout)
+        devs = [dev_num for dev_num in range(count)
+                if (arx_addr, dev_num) not in self._onewire_sn]
+        if devs:
+            rtns = self._send_batch(
+                arx_addr, [('owsn', '{:01X}'.format(dev_num))
+                           for dev_num in devs], user_timeout)
+            for dev_num, rtn in zip(devs, rtns):
+                self._check_rtn(rtn, ONEWIRE_SERIAL_NUMBER_ERRORS)
+                sn = rtn['1wire_sn']
+                _check_1wire_sn(sn)
+                self._onewire_sn[(arx_addr, dev_num)] = sn
+        return [self._onewire_sn[(arx_addr, dev_num)]
+                for dev_num in range(count)]
 
     def get_1wire_temp(self,
                        arx_addr: int,
@@ -1989,10 +3454,8 @@ class ARX:
 
         """
 
-        rtn = self._send(arx_addr, 'owte', '',user_timeout)
-
-        self._check_rtn(rtn, ONEWIRE_TEMP_ERRORS)
-        return rtn['1wire_temp']
+        return self._cmd(arx_addr, 'owte', '', '1wire_temp',
+                         ONEWIRE_TEMP_ERRORS, user_timeout=user_timeout)
 
     def reset(self, arx_addr: int, user_timeout: int = USER_TIMEOUT):
         """Reset the processor on the ARX board. The board will reset to its
@@ -2010,6 +3473,7 @@ class ARX:
         ArxException on any ARX related errors.
 
         """
+        self.refresh_board_info(arx_addr)
         rtn = self._send(arx_addr, 'rset', '',user_timeout)
         # Dont' check return as this command does not respond so a read
         # timeout on the serial device will occur. Ignore it.
@@ -2069,6 +3533,5 @@ class ARX:
         ArxException on any ARX related errors.
 
         """
-        rtn = self._send(arx_addr, 'last', '',user_timeout)
-        self._check_rtn(rtn, None)
-        return rtn['last_cmd']
+        return self._cmd(arx_addr, 'last', '', 'last_cmd',
+                         user_timeout=user_timeout)
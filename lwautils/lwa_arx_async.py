@@ -0,0 +1,333 @@
+""" AsyncARX is an asyncio version of the ARX class.
+
+    >>> # Example using AsyncARX class
+    >>>
+    >>> import asyncio
+    >>> import lwautils.lwa_arx_async as arx_async
+    >>> my_arx = arx_async.AsyncARX()
+    >>> temps = asyncio.run(my_arx.get_microcontroller_temp_many([17, 21]))
+    >>> print(temps)
+    >>> {17: 31.5, 21: 30.9}
+"""
+
+import asyncio
+import lwautils.ArxException as ARXE
+import lwautils.lwa_arx as arx
+
+
+class AsyncARX:
+    __slots__ = ('arx', 'my_cr')
+
+    def __init__(self, conf: str = None):
+        """c-tor. Controls and Monitors ARX boards from asyncio code.
+
+        Note
+        ----
+        Commands are awaited with CmdRsp.send_async(), so any number of
+        them can be in flight on one thread. Validation, encoding and
+        decoding are shared with a wrapped ARX object.
+
+        Args
+        ----
+        conf
+            Optional etcd configuration file.
+
+        """
+        self.arx = arx.ARX(conf)
+        self.my_cr = self.arx.my_cr
+
+    async def _send(self,
+                    arx_addr: int,
+                    cmd: str,
+                    val: str = '',
+                    user_timeout: int = arx.USER_TIMEOUT) -> dict:
+        """Private coroutine to send command dictionary to arx board.
+
+        Raises
+        ------
+        ArxException
+           Invalid board address.
+        ServiceNoResponseException
+           No response within user_timeout.
+
+        """
+
+        self.arx._check_brd_addr(arx_addr)
+        cmd_key, key = arx._keys_for(arx_addr)
+        return await self.my_cr.send_async(cmd_key, cmd, val, user_timeout,
+                                           resp_key=key)
+
+    async def _cmd(self,
+                   arx_addr: int,
+                   cmd: str,
+                   val: str = '',
+                   key: str = None,
+                   errors: dict = None,
+                   user_timeout: int = arx.USER_TIMEOUT):
+        """Private coroutine version of ARX._cmd().
+        """
+
+        rtn = await self._send(arx_addr, cmd, val, user_timeout)
+        self.arx._check_rtn(rtn, errors)
+        return rtn[key] if key else rtn
+
+    async def _gather(self, arx_addrs: list, coro, *args) -> dict:
+        """Helper to run coro(arx_addr, *args) for several boards at once.
+
+        Returns
+        -------
+        dict
+            Board address -> result, or the exception raised for the board.
+
+        """
+
+        arx_addrs = list(arx_addrs)
+        rtns = await asyncio.gather(
+            *(coro(arx_addr, *args) for arx_addr in arx_addrs),
+            return_exceptions=True)
+        return dict(zip(arx_addrs, rtns))
+
+    async def get_board_info(self,
+                             arx_addr: int,
+                             user_timeout: int = arx.USER_TIMEOUT) -> dict:
+        """Return board info. See: ARX.get_board_info().
+        """
+
+        rtn = await self._cmd(arx_addr, 'arxn', '', None,
+                              user_timeout=user_timeout)
+        return dict(self.arx._store_board_info(arx_addr, rtn))
+
+    async def get_microcontroller_temp(
+            self,
+            arx_addr: int,
+            user_timeout: int = arx.USER_TIMEOUT) -> float:
+        """Return microcontroller temperature in C.
+           See: ARX.get_microcontroller_temp().
+        """
+
+        return await self._cmd(arx_addr, 'temp', '', 'brd_temp',
+                               user_timeout=user_timeout)
+
+    async def get_microcontroller_temp_many(
+            self,
+            arx_addrs: list,
+            user_timeout: int = arx.USER_TIMEOUT) -> dict:
+        """Return the microcontroller temperature of several boards.
+
+        Returns
+        -------
+        dict
+            Board address -> temperature in C, or the exception raised for
+            the board.
+
+        """
+
+        return await self._gather(arx_addrs, self.get_microcontroller_temp,
+                                  user_timeout)
+
+    async def echo(self,
+                   arx_addr: int,
+                   val: str,
+                   user_timeout: int = arx.USER_TIMEOUT) -> str:
+        """Echo val through the board. See: ARX.echo().
+
+        Raises
+        ------
+        ArxException
+           Returned value does not match val.
+
+        """
+
+        rtn = await self._cmd(arx_addr, 'echo', val, 'echo',
+                              user_timeout=user_timeout)
+        e_val = rtn.partition("ECHO")[2]
+        if e_val != str(val):
+            raise ARXE.ArxException(
+                "Echo return do not match sent. Sent= {}, return= {}".format(
+                    val, e_val))
+        return rtn
+
+    async def get_chan_cfg(self,
+                           arx_addr: int,
+                           chan: int,
+                           user_timeout: int = arx.USER_TIMEOUT) -> dict:
+        """Return the channel's configuration. See: ARX.get_chan_cfg().
+        """
+
+        self.arx._check_channel(chan)
+        rtn = await self._cmd(arx_addr, 'getc', arx.CHAN_HEX1[chan],
+                              'chan_config', arx.SET_CHAN_CFG_ERRORS,
+                              user_timeout=user_timeout)
+        return self.arx._decode_cfg(rtn[0])
+
+    async def get_all_chan_cfg(self,
+                               arx_addr: int,
+                               user_timeout: int = arx.USER_TIMEOUT) -> list:
+        """Return all channel configurations. See: ARX.get_all_chan_cfg().
+        """
+
+        rtn = await self._cmd(arx_addr, 'geta', '', 'chan_config',
+                              arx.SET_CHAN_CFG_ERRORS,
+                              user_timeout=user_timeout)
+        return [self.arx._decode_cfg(chan_cfg) for chan_cfg in rtn]
+
+    async def set_chan_cfg(self,
+                           arx_addr: int,
+                           chan: int,
+                           chan_cfg: dict,
+                           user_timeout: int = arx.USER_TIMEOUT) -> str:
+        """Send a channel's configuration. See: ARX.set_chan_cfg().
+
+        Note
+        ----
+        The wrapped ARX object's local configuration is not changed.
+
+        """
+
+        self.arx._check_channel(chan)
+        chan_cfg_str = arx.CHAN_CFG_FMT % (chan,
+                                           self.arx._encode_cfg(chan_cfg))
+        await self._cmd(arx_addr, 'setc', chan_cfg_str, None,
+                        arx.SET_CHAN_CFG_ERRORS, user_timeout=user_timeout)
+        return ""
+
+    async def set_all_chan_cfg(self,
+                               arx_addr: int,
+                               chan_cfg: dict,
+                               user_timeout: int = arx.USER_TIMEOUT) -> str:
+        """Send one configuration to all channels.
+           See: ARX.set_all_chan_cfg().
+        """
+
+        chan_cfg_str = arx._cfg_hex(self.arx._encode_cfg(chan_cfg))
+        await self._cmd(arx_addr, 'seta', chan_cfg_str, None,
+                        arx.SET_ALL_CHAN_CFG_ERRORS, user_timeout=user_timeout)
+        return ""
+
+    async def set_all_different_chan_cfg(
+            self,
+            arx_addr: int,
+            chan_cfgs: list,
+            user_timeout: int = arx.USER_TIMEOUT) -> str:
+        """Send a configuration to each channel, with 'seta' if they are
+           all the same. See: ARX.set_all_different_chan_cfg().
+        """
+
+        if len(chan_cfgs) != arx.MAX_CHAN:
+            raise ARXE.ArxException(
+                "Expected {} channel configurations. Got {}".format(
+                    arx.MAX_CHAN, len(chan_cfgs)))
+        cmd, chan_cfg_str, errors = arx._all_chan_cfg_cmd(
+            [self.arx._encode_cfg(chan_cfg) for chan_cfg in chan_cfgs])
+        await self._cmd(arx_addr, cmd, chan_cfg_str, None, errors,
+                        user_timeout=user_timeout)
+        return ""
+
+    async def get_all_chan_power(self,
+                                 arx_addr: int,
+                                 user_timeout: int = arx.USER_TIMEOUT) -> list:
+        """Return all channel powers in Watts.
+           See: ARX.get_all_chan_power().
+        """
+
+        rtn = await self._cmd(arx_addr, 'powa', '', 'chan_microwatts',
+                              user_timeout=user_timeout)
+        return [pwr * arx.WATTS_PER_MICROWATT for pwr in rtn]
+
+    async def get_all_chan_current(
+            self,
+            arx_addr: int,
+            user_timeout: int = arx.USER_TIMEOUT) -> list:
+        """Return all channel currents in Amps.
+           See: ARX.get_all_chan_current().
+        """
+
+        brd_info = self.arx._board_info.get(arx_addr)
+        if brd_info is None:
+            await self.get_board_info(arx_addr, user_timeout)
+            brd_info = self.arx._board_info[arx_addr]
+        rtn = await self._cmd(arx_addr, 'cura', '', 'chan_current_adc',
+                              user_timeout=user_timeout)
+        return self.arx._adc2amps(rtn, brd_info['input_coupling'])
+
+    async def get_all_chan_power_many(
+            self,
+            arx_addrs: list,
+            user_timeout: int = arx.USER_TIMEOUT) -> dict:
+        """Return all channel powers of several boards.
+
+        Returns
+        -------
+        dict
+            Board address -> list of channel powers in Watts, or the
+            exception raised for the board.
+
+        """
+
+        return await self._gather(arx_addrs, self.get_all_chan_power,
+                                  user_timeout)
+
+    async def get_all_chan_current_many(
+            self,
+            arx_addrs: list,
+            user_timeout: int = arx.USER_TIMEOUT) -> dict:
+        """Return all channel currents of several boards.
+
+        Returns
+        -------
+        dict
+            Board address -> list of channel currents in Amps, or the
+            exception raised for the board.
+
+        """
+
+        return await self._gather(arx_addrs, self.get_all_chan_current,
+                                  user_timeout)
+
+    async def get_board_current(self,
+                                arx_addr: int,
+                                user_timeout: int = arx.USER_TIMEOUT) -> float:
+        """Return board current in Amps. See: ARX.get_board_current().
+        """
+
+        rtn = await self._cmd(arx_addr, 'curb', '', 'brd_milliamps',
+                              user_timeout=user_timeout)
+        return rtn * 0.001
+
+    async def get_1wire_count(self,
+                              arx_addr: int,
+                              user_timeout: int = arx.USER_TIMEOUT) -> int:
+        """Return number of 1wire devices. See: ARX.get_1wire_count().
+        """
+
+        return await self._cmd(arx_addr, 'owdc', '', '1wire_dev_count',
+                               user_timeout=user_timeout)
+
+    async def get_1wire_temp(
+            self,
+            arx_addr: int,
+            user_timeout: int = arx.ONEWIRE_TEMP_TIMEOUT) -> list:
+        """Return temperatures in C for all 1wire devices.
+           See: ARX.get_1wire_temp().
+        """
+
+        return await self._cmd(arx_addr, 'owte', '', '1wire_temp',
+                               arx.ONEWIRE_TEMP_ERRORS,
+                               user_timeout=user_timeout)
+
+    async def get_1wire_temp_many(
+            self,
+            arx_addrs: list,
+            user_timeout: int = arx.ONEWIRE_TEMP_TIMEOUT) -> dict:
+        """Return the 1wire temperatures of several boards.
+
+        Returns
+        -------
+        dict
+            Board address -> list of 1wire device temperatures in C, or the
+            exception raised for the board.
+
+        """
+
+        return await self._gather(arx_addrs, self.get_1wire_temp,
+                                  user_timeout)
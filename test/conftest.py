@@ -0,0 +1,141 @@
+"""Shared pytest fixtures.
+
+FakeStore stands in for dsautils.dsa_store.DsaStore so CmdRsp and ARX can
+be tested without etcd or ARX boards.
+"""
+
+import itertools
+import json
+import threading
+
+import pytest
+
+import lwautils.cmd_rsp as cr
+import lwautils.lwa_arx as arx
+
+
+class FakeStore:
+    """In memory DsaStore answering commands like a service would.
+
+    Args
+    ----
+    responder
+        Optional callable taking (cmd_key, cmd_dict) and returning the
+        response dictionary, or None to never respond.
+    delay
+        Seconds before a response is written, from another thread. A
+        callable returning the delay may be given instead. Responses are
+        written synchronously from put_dict() if 0.
+    """
+
+    def __init__(self, responder=None, delay=0.0):
+        self.responder = responder
+        self.delay = delay
+        self.data = {}
+        # (key, dict) of every put_dict() call, in order
+        self.puts = []
+        # keys passed to delete(), in order
+        self.deletes = []
+        self.gets = []
+        self.watches = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def add_watch_prefix(self, prefix, cb):
+        watch_id = next(self._ids)
+        with self._lock:
+            self.watches[watch_id] = (prefix, cb)
+        return watch_id
+
+    def cancel(self, watch_id):
+        with self._lock:
+            self.watches.pop(watch_id, None)
+
+    def get_dict(self, key):
+        self.gets.append(key)
+        return self.data.get(key)
+
+    def delete(self, key):
+        with self._lock:
+            self.deletes.append(key)
+            self.data.pop(key, None)
+        # a delete event carries no value
+        self.notify(key, None)
+
+    def put_dict(self, key, d):
+        # etcd only keeps the serialized value
+        d = json.loads(json.dumps(d))
+        with self._lock:
+            self.puts.append((key, d))
+        self.write(key, d)
+        if self.responder is None or 'respkey' not in d:
+            return
+        rsp = self.responder(key, d)
+        if rsp is None:
+            return
+        rsp = dict(rsp, id=d['id'])
+        delay = self.delay() if callable(self.delay) else self.delay
+        if delay:
+            threading.Timer(delay, self.write, (d['respkey'], rsp)).start()
+        else:
+            self.write(d['respkey'], rsp)
+
+    def write(self, key, d):
+        """Store d under key and send it to the matching watches."""
+        with self._lock:
+            self.data[key] = d
+        self.notify(key, d)
+
+    def notify(self, key, val):
+        with self._lock:
+            watches = list(self.watches.values())
+        for prefix, cb in watches:
+            if key.startswith(prefix):
+                cb([key, val])
+
+    def cmds(self, key_prefix=''):
+        """Return the (key, cmd, val) of every command put so far."""
+        return [(key, d['cmd'], d['val'].get('val'))
+                for key, d in self.puts
+                if key.startswith(key_prefix) and 'cmd' in d]
+
+
+# Canned replies of an ARX board, by command.
+BOARD_REPLIES = {
+    'arxn': {'brd_id': 7, 'sw_ver': 258,
+             'input_coupling': [0] * 8 + [1] * 8,
+             '1wire_temp_count': 3, '1wire_temp_chan_map': [0, 5, 10]},
+    'temp': {'brd_temp': 30.5},
+    'geta': {'chan_config': [0x8006 + i for i in range(16)]},
+    'getc': {'chan_config': [0x8006]},
+    'powa': {'chan_microwatts': [float(i) for i in range(16)]},
+    'cura': {'chan_current_adc': [100 + i for i in range(16)]},
+    'curc': {'chan_current_adc': [103]},
+    'curb': {'brd_milliamps': 800},
+    'owdc': {'1wire_dev_count': 1},
+    'owsn': {'1wire_sn': 'A200000001B81C02'},
+    'owte': {'1wire_temp': [25.0]},
+}
+
+
+def board_responder(key, cmd_dict):
+    """Answer ARX commands with BOARD_REPLIES and an empty err_str."""
+    rsp = {'err_str': ''}
+    rsp.update(BOARD_REPLIES.get(cmd_dict['cmd'], {}))
+    return rsp
+
+
+@pytest.fixture
+def fake_store(monkeypatch):
+    """A FakeStore answering ARX commands, used by every new client."""
+    store = FakeStore(board_responder)
+    monkeypatch.setattr(cr, '_STORE', store)
+    arx.close_clients()
+    yield store
+    arx.close_clients()
+
+
+@pytest.fixture
+def fake_arx(fake_store):
+    """An ARX object talking to fake_store."""
+    return arx.ARX()
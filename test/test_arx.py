@@ -11,8 +11,7 @@ sys.path.append(str(Path('..')))
 import lwautils.lwa_arx as arx
 import lwautils.ArxException as arxe 
 
-from pkg_resources import Requirement, resource_filename
-etcdconf = resource_filename(Requirement.parse("lwa-pyutils"), "lwautils/conf/etcdConfig.yml")
+etcdconf = arx.ETCDCONF
 
 if not sys.warnoptions:
     import warnings
@@ -35,7 +34,10 @@ FIRST_ATTEN_START_BIT = 3
 SECOND_ATTEN_MASK = 0x7e00
 SECOND_ATTEN_START_BIT = 9
 
-my_arx = arx.ARX()
+@pytest.fixture(scope="session")
+def my_arx():
+    """One ARX object shared by all tests in the session."""
+    return arx.ARX()
 
 def get_first_atten(val, fa):
     b = (val ^ 0xFFFF) & 0x3F
@@ -46,7 +48,6 @@ def get_first_atten(val, fa):
     # set b3:b8 with b
     fa |= (b << FIRST_ATTEN_START_BIT)
 
-    print('val: {}, mask: {:016b}, b: {:016b}, fa: {:016b}'.format(val, FIRST_ATTEN_MASK, b, fa))
     return fa
 
 def get_second_atten(val, fa):
@@ -58,14 +59,13 @@ def get_second_atten(val, fa):
     # set b9:b14 with b
     fa |= (b << SECOND_ATTEN_START_BIT)
 
-    print('val: {}, mask: {:016b}, b: {:016b}, fa: {:016b}'.format(val, SECOND_ATTEN_MASK, b, fa))
     return fa
 
 def assertEqual(a, b):
     assert a == b
 
 @pytest.mark.serial9
-def test_chan_cfg1():
+def test_chan_cfg1(my_arx):
 #    my_arx = arx.ARX()
     cfg = {}
     cfg['sig_on'] = False
@@ -105,40 +105,40 @@ def test_chan_cfg1():
 @pytest.mark.chancurrent
 @pytest.mark.parametrize("arx_addr",ARX_ADDRS)
 @pytest.mark.parametrize("ichan",CHANNELS)
-def test_get_chan_current(arx_addr, ichan):
+def test_get_chan_current(my_arx, arx_addr, ichan):
     cv = my_arx.get_chan_current(arx_addr, ichan)
     assertEqual(1,1)
 
 @pytest.mark.chanpower
 @pytest.mark.parametrize("arx_addr",ARX_ADDRS)
 @pytest.mark.parametrize("ichan",CHANNELS)
-def test_get_chan_power(arx_addr, ichan):
+def test_get_chan_power(my_arx, arx_addr, ichan):
     cv = my_arx.get_chan_power(arx_addr, ichan)
     assertEqual(1,1)
     
 @pytest.mark.chanvoltage
 @pytest.mark.parametrize("arx_addr",ARX_ADDRS)
 @pytest.mark.parametrize("ichan",CHANNELS)
-def test_get_chan_voltage(arx_addr, ichan):
+def test_get_chan_voltage(my_arx, arx_addr, ichan):
     cv = my_arx.get_chan_current(arx_addr, ichan)
     assertEqual(1,1)
 
 @pytest.mark.allchancurrent
 @pytest.mark.parametrize("arx_addr",ARX_ADDRS)
-def test_get_all_chan_current(arx_addr):
+def test_get_all_chan_current(my_arx, arx_addr):
     cc = my_arx.get_all_chan_current(arx_addr)
     assertEqual(len(cc), MAX_NUM_OF_CHAN)
 
 @pytest.mark.allchanpower
 @pytest.mark.parametrize("arx_addr",ARX_ADDRS)
-def test_get_all_chan_power(arx_addr):
+def test_get_all_chan_power(my_arx, arx_addr):
     cp = my_arx.get_all_chan_power(arx_addr)
     assertEqual(len(cp), MAX_NUM_OF_CHAN)
 
 @pytest.mark.badchannel
 @pytest.mark.parametrize("arx_addr",ARX_ADDRS)
 @pytest.mark.parametrize("ichan",BAD_CHANNELS)
-def test_get_chan_power(arx_addr, ichan):
+def test_get_chan_power(my_arx, arx_addr, ichan):
     try:
         cv = my_arx.get_chan_power(arx_addr, ichan)
     except arxe.ArxException as arxex:
@@ -155,7 +155,7 @@ def test_get_chan_power(arx_addr, ichan):
 @pytest.mark.parametrize("first_atten",ATTEN_SHORT)
 @pytest.mark.parametrize("second_atten",ATTEN_SHORT)
 @pytest.mark.parametrize("dc_on",[True,False])
-def test_chan_cfg_short(arx_addr, ichan, sig_on, narrow_lpf, narrow_hpf,
+def test_chan_cfg_short(my_arx, arx_addr, ichan, sig_on, narrow_lpf, narrow_hpf,
                   first_atten, second_atten, dc_on):
 #    my_arx = arx.ARX()
     print(arx_addr, ichan)
@@ -181,7 +181,7 @@ def test_get_board_id(arx_addr):
 
 @pytest.mark.goodaddrs
 @pytest.mark.parametrize("arx_addr",GOOD_ADDRS)
-def test_check_brd_addr(arx_addr):
+def test_check_brd_addr(my_arx, arx_addr):
     try:
         my_arx._check_brd_addr(arx_addr)
     except:
@@ -189,7 +189,7 @@ def test_check_brd_addr(arx_addr):
 
 @pytest.mark.badaddrs
 @pytest.mark.parametrize("arx_addr",BAD_ADDRS)
-def test_check_brd_addr2(arx_addr):
+def test_check_brd_addr2(my_arx, arx_addr):
     try:
         my_arx._check_brd_addr(arx_addr)
     except arxe.ArxException as arxex:
@@ -199,7 +199,7 @@ def test_check_brd_addr2(arx_addr):
 
 @pytest.mark.goodbaud
 @pytest.mark.parametrize("baud_factor",GOOD_BAUD_FACTOR)
-def test_check_baud_factor(baud_factor):
+def test_check_baud_factor(my_arx, baud_factor):
     try:
         my_arx._check_baud_factor(baud_factor)
     except:
@@ -207,7 +207,7 @@ def test_check_baud_factor(baud_factor):
 
 @pytest.mark.badbaud
 @pytest.mark.parametrize("baud_factor",BAD_BAUD_FACTOR)
-def test_check_baud_factor2(baud_factor):
+def test_check_baud_factor2(my_arx, baud_factor):
     try:
         my_arx._check_baud_factor(baud_factor)
     except arxe.ArxException as arxex:
@@ -217,7 +217,7 @@ def test_check_baud_factor2(baud_factor):
 
 @pytest.mark.goodchancfg
 @pytest.mark.parametrize("chan_cfg",GOOD_CHAN_CFG)
-def test_check_config_dict(chan_cfg):
+def test_check_config_dict(my_arx, chan_cfg):
     try:
         my_arx._check_config_dict(chan_cfg)
     except:
@@ -225,7 +225,7 @@ def test_check_config_dict(chan_cfg):
 
 @pytest.mark.badchancfg
 @pytest.mark.parametrize("chan_cfg",BAD_CHAN_CFG)
-def test_check_config_dict2(chan_cfg):
+def test_check_config_dict2(my_arx, chan_cfg):
     try:
         my_arx._check_config_dict(chan_cfg)
     except arxe.ArxException as arxex:
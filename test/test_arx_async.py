@@ -0,0 +1,73 @@
+"""Test code for lwa_arx_async.py
+   execute 'pytest' to run tests. No ARX board or etcd server is needed.
+"""
+
+import asyncio
+
+import pytest
+
+import conftest
+import lwautils.lwa_arx as arx
+import lwautils.lwa_arx_async as arx_async
+import lwautils.ArxException as arxe
+import lwautils.ServiceNoResponseException as snre
+
+CFG = {'sig_on': True, 'narrow_lpf': False, 'narrow_hpf': True,
+       'first_atten': 3.5, 'second_atten': 10.0, 'dc_on': True}
+NAK_ADDR = 21
+SILENT_ADDR = 45
+TIMEOUT = 0.2
+
+
+def responder(key, cmd_dict):
+    arx_addr = int(key.rpartition('/')[2])
+    if arx_addr == SILENT_ADDR:
+        return None
+    if arx_addr == NAK_ADDR:
+        return {'err_str': '{"ERR": "NAK", "MSG": "33"}'}
+    return conftest.board_responder(key, cmd_dict)
+
+
+@pytest.fixture
+def my_arx(fake_store):
+    fake_store.responder = responder
+    return arx_async.AsyncARX()
+
+
+def test_get_microcontroller_temp(my_arx):
+    assert asyncio.run(my_arx.get_microcontroller_temp(17)) == 30.5
+
+
+def test_gather_returns_per_board_exceptions(my_arx):
+    temps = asyncio.run(my_arx.get_microcontroller_temp_many(
+        [17, NAK_ADDR, SILENT_ADDR, 0], TIMEOUT))
+    assert list(temps) == [17, NAK_ADDR, SILENT_ADDR, 0]
+    assert temps[17] == 30.5
+    assert isinstance(temps[NAK_ADDR], arxe.ArxException)
+    assert isinstance(temps[SILENT_ADDR], snre.ServiceNoResponseException)
+    # invalid address
+    assert isinstance(temps[0], arxe.ArxException)
+
+
+def test_get_all_chan_current_many(my_arx):
+    sync_arx = arx.ARX()
+    amps = asyncio.run(my_arx.get_all_chan_current_many([17, 31, NAK_ADDR],
+                                                        TIMEOUT))
+    assert amps[17] == amps[31] == sync_arx.get_all_chan_current(17)
+    assert isinstance(amps[NAK_ADDR], arxe.ArxException)
+
+
+@pytest.mark.parametrize("cfgs", [
+    [CFG] * 16,
+    [dict(CFG, first_atten=i * 0.5) for i in range(16)],
+])
+def test_set_all_different_chan_cfg_matches_sync(my_arx, fake_store, cfgs):
+    asyncio.run(my_arx.set_all_different_chan_cfg(17, cfgs))
+    sent = fake_store.cmds('/cmd/arx/')[-1]
+    arx.ARX().set_all_different_chan_cfg(17, cfgs)
+    assert fake_store.cmds('/cmd/arx/')[-1] == sent
+
+
+def test_set_all_different_chan_cfg_count(my_arx):
+    with pytest.raises(arxe.ArxException):
+        asyncio.run(my_arx.set_all_different_chan_cfg(17, [CFG] * 15))
@@ -0,0 +1,458 @@
+"""Test code for lwa_arx.py that needs no ARX board or etcd server.
+   execute 'pytest' to run tests.
+"""
+
+import time
+
+import pytest
+
+import conftest
+import lwautils.lwa_arx as arx
+import lwautils.ArxException as arxe
+
+
+def test_log_created_on_first_arx(fake_store, monkeypatch):
+    monkeypatch.setattr(arx, '_LOG', None)
+    my_arx = arx.ARX()
+    assert arx._LOG is not None
+    assert my_arx.log is arx._LOG
+    assert arx.ARX().log is my_arx.log
+
+
+CFG = {'sig_on': True, 'narrow_lpf': False, 'narrow_hpf': True,
+       'first_atten': 3.5, 'second_atten': 10.0, 'dc_on': True}
+NAK_REPLY = {'err_str': '{"ERR": "NAK", "MSG": "33"}'}
+
+
+def count(store, arx_addr, cmd):
+    return [c for _, c, _ in store.cmds('/cmd/arx/{}'.format(arx_addr))
+            ].count(cmd)
+
+
+def test_cache_hit_within_ttl(fake_store):
+    my_arx = arx.ARX(cache_ttl=60)
+    first = my_arx.get_all_chan_cfg(17)
+    assert my_arx.get_all_chan_cfg(17) == first
+    assert count(fake_store, 17, 'geta') == 1
+
+
+def test_cache_expires(fake_store):
+    my_arx = arx.ARX(cache_ttl=0.05)
+    my_arx.get_all_chan_cfg(17)
+    time.sleep(0.1)
+    my_arx.get_all_chan_cfg(17)
+    assert count(fake_store, 17, 'geta') == 2
+
+
+def test_cache_setter_invalidates_board(fake_store):
+    my_arx = arx.ARX(cache_ttl=60)
+    my_arx.get_all_chan_cfg(17)
+    my_arx.get_all_chan_cfg(21)
+    my_arx.set_all_chan_cfg(21, CFG)
+    my_arx.get_all_chan_cfg(17)
+    my_arx.get_all_chan_cfg(21)
+    assert count(fake_store, 17, 'geta') == 1
+    assert count(fake_store, 21, 'geta') == 2
+
+
+def test_cache_skips_errors(fake_store):
+    def responder(key, cmd_dict):
+        if cmd_dict['cmd'] == 'geta':
+            return NAK_REPLY
+        return conftest.board_responder(key, cmd_dict)
+
+    fake_store.responder = responder
+    my_arx = arx.ARX(cache_ttl=60)
+    for _ in range(2):
+        with pytest.raises(arxe.ArxException):
+            my_arx.get_all_chan_cfg(17)
+    assert count(fake_store, 17, 'geta') == 2
+
+
+def test_no_cache_by_default(fake_arx, fake_store):
+    fake_arx.get_all_chan_cfg(17)
+    fake_arx.get_all_chan_cfg(17)
+    assert count(fake_store, 17, 'geta') == 2
+    assert len(fake_arx._cache) == 0
+
+
+ATTENS = [x * 0.5 for x in range(64)]
+
+
+@pytest.mark.parametrize("first_atten", ATTENS)
+def test_encode_decode_round_trip(fake_arx, first_atten):
+    for second_atten in ATTENS:
+        for flags in range(16):
+            cfg = {'sig_on': bool(flags & 1),
+                   'narrow_lpf': bool(flags & 2),
+                   'narrow_hpf': bool(flags & 4),
+                   'first_atten': first_atten,
+                   'second_atten': second_atten,
+                   'dc_on': bool(flags & 8)}
+            word = fake_arx._encode_cfg(cfg)
+            assert 0 <= word <= 0xFFFF
+            assert fake_arx._decode_cfg(word) == cfg
+
+
+def test_encode_known_word(fake_arx):
+    cfg = {'sig_on': False, 'narrow_lpf': True, 'narrow_hpf': False,
+           'first_atten': 31.5, 'second_atten': 31.5, 'dc_on': True}
+    assert fake_arx._encode_cfg(cfg) == 0x8006
+    assert fake_arx._decode_cfg(0x8006) == cfg
+    # 0dB attenuation is all ones in the inverted fields
+    cfg.update(first_atten=0.0, second_atten=0.0)
+    assert fake_arx._encode_cfg(cfg) == 0xFFFE
+
+
+def last_cmd(store):
+    key, cmd, val = store.cmds('/cmd/arx/')[-1]
+    return cmd, val
+
+
+def words_hex(words):
+    return ''.join('{:04X}'.format(word) for word in words)
+
+
+def test_set_all_first_atten_flush(fake_arx, fake_store):
+    fake_arx.set_all_first_atten(list(range(16)))
+    assert fake_arx._dirty == set(range(16))
+    fake_arx.flush_chan_cfg(17)
+    # inverted attenuation in b3:b8 of otherwise clear words
+    assert last_cmd(fake_store) == (
+        'sets', words_hex((63 - i) << 3 for i in range(16)))
+    assert fake_arx._dirty == set()
+
+    # nothing left to send
+    puts = len(fake_store.puts)
+    assert fake_arx.flush_chan_cfg(17) == ""
+    assert len(fake_store.puts) == puts
+
+
+def test_set_all_second_atten(fake_arx, fake_store):
+    fake_arx.set_all_second_atten([63 - i for i in range(16)])
+    fake_arx.flush_chan_cfg(17)
+    assert last_cmd(fake_store) == ('sets', words_hex(i << 9
+                                                      for i in range(16)))
+
+
+@pytest.mark.parametrize("setter,word", [
+    ('set_all_dc_on', 0x8000),
+    ('set_all_narrow_lpf', 0x0004),
+    # narrow hpf with the signal still on
+    ('set_all_narrow_hpf', 0x0003),
+])
+def test_set_all_bit_flush_uses_seta(fake_arx, fake_store, setter, word):
+    getattr(fake_arx, setter)()
+    fake_arx.flush_chan_cfg(17)
+    assert last_cmd(fake_store) == ('seta', '{:04X}'.format(word))
+    assert fake_arx._dirty == set()
+
+
+def test_set_all_sig_on_off(fake_arx, fake_store):
+    fake_arx.set_all_sig_on(False)
+    fake_arx.flush_chan_cfg(17)
+    assert last_cmd(fake_store) == ('seta', '0002')
+    fake_arx.set_all_sig_on(True)
+    fake_arx.flush_chan_cfg(17)
+    assert last_cmd(fake_store) == ('seta', '0000')
+
+
+def test_set_all_first_atten_invalid(fake_arx):
+    with pytest.raises(arxe.ArxException):
+        fake_arx.set_all_first_atten([0] * 15)
+    with pytest.raises(arxe.ArxException):
+        fake_arx.set_all_first_atten([64] * 16)
+    assert fake_arx._dirty == set()
+
+
+def test_flush_one_channel_uses_setc(fake_arx, fake_store):
+    fake_arx.set_all_different_chan_cfg(17, [CFG] * 16)
+    assert fake_arx._dirty == set()
+    fake_arx._set_chan_cfg_first_atten(5, 0)
+    assert fake_arx._dirty == {5}
+    fake_arx.flush_chan_cfg(17)
+    cfg = dict(CFG, first_atten=0.0)
+    assert last_cmd(fake_store) == (
+        'setc', '5{:04X}'.format(fake_arx._encode_cfg(cfg)))
+    assert fake_arx._dirty == set()
+
+
+def test_set_all_different_same_uses_seta(fake_arx, fake_store):
+    fake_arx.set_all_different_chan_cfg(17, [CFG] * 16)
+    assert last_cmd(fake_store) == (
+        'seta', '{:04X}'.format(fake_arx._encode_cfg(CFG)))
+    assert fake_arx._dirty == set()
+
+
+def test_set_all_chan_cfg_clears_dirty(fake_arx, fake_store):
+    fake_arx.set_all_chan_cfg(17, CFG)
+    assert last_cmd(fake_store) == (
+        'seta', '{:04X}'.format(fake_arx._encode_cfg(CFG)))
+    assert fake_arx._dirty == set()
+
+
+def test_set_all_different_uses_sets(fake_arx, fake_store):
+    cfgs = [dict(CFG, first_atten=i * 0.5) for i in range(16)]
+    fake_arx.set_all_different_chan_cfg(17, cfgs)
+    assert last_cmd(fake_store) == (
+        'sets', words_hex(fake_arx._encode_cfg(cfg) for cfg in cfgs))
+
+
+def test_staged_sends_one_sets(fake_arx, fake_store):
+    with fake_arx.staged(17) as cfgs:
+        cfgs[0]['first_atten'] = 3.5
+    # board words are 0x8006 + chan, 3.5dB is 63 - 7 inverted in b3:b8
+    words = [0x8006 + i for i in range(16)]
+    words[0] |= 56 << 3
+    assert fake_store.cmds('/cmd/arx/') == [
+        ('/cmd/arx/17', 'geta', ''), ('/cmd/arx/17', 'sets', words_hex(words))]
+
+
+def test_staged_sends_nothing_on_error(fake_arx, fake_store):
+    with pytest.raises(RuntimeError):
+        with fake_arx.staged(17) as cfgs:
+            cfgs[0]['first_atten'] = 3.5
+            raise RuntimeError()
+    assert [cmd for _, cmd, _ in fake_store.cmds('/cmd/arx/')] == ['geta']
+
+
+@pytest.mark.parametrize("cfgs", [
+    CFG,
+    [CFG] * 16,
+    [dict(CFG, second_atten=i * 0.5) for i in range(16)],
+])
+def test_compile_template_matches_setters(fake_arx, fake_store, cfgs):
+    fake_arx.compile_template(cfgs)(17)
+    templated = last_cmd(fake_store)
+    if isinstance(cfgs, dict):
+        fake_arx.set_all_chan_cfg(17, cfgs)
+    else:
+        fake_arx.set_all_different_chan_cfg(17, cfgs)
+    assert last_cmd(fake_store) == templated
+
+
+# Maxim AN27 example ROM code, MSB first: CRC A2, serial 0x0001B81C,
+# family 02
+AN27_ROM = 'A200000001B81C02'
+
+
+def test_1wire_sn_crc_ok():
+    arx._check_1wire_sn(AN27_ROM)
+
+
+@pytest.mark.parametrize("bit", range(64))
+def test_1wire_sn_crc_bit_flip(bit):
+    sn = '{:016X}'.format(int(AN27_ROM, 16) ^ (1 << bit))
+    with pytest.raises(arxe.ArxException):
+        arx._check_1wire_sn(sn)
+
+
+def test_1wire_sn_crc_byte_order():
+    # the same ROM code LSB first must not pass
+    sn = bytes(reversed(bytes.fromhex(AN27_ROM))).hex().upper()
+    assert sn == '021CB801000000A2'
+    with pytest.raises(arxe.ArxException):
+        arx._check_1wire_sn(sn)
+
+
+@pytest.mark.parametrize("sn", ['A200000001B81C0200', 'A2', 'XYZ', '', None])
+def test_1wire_sn_malformed(sn):
+    with pytest.raises(arxe.ArxException):
+        arx._check_1wire_sn(sn)
+
+
+def test_get_1wire_sn_checks_crc(fake_arx, fake_store):
+    assert fake_arx.get_1wire_SN(17, 0) == AN27_ROM
+
+    def responder(key, cmd_dict):
+        return {'err_str': '', '1wire_sn': 'A300000001B81C02'}
+
+    fake_store.responder = responder
+    with pytest.raises(arxe.ArxException):
+        fake_arx.get_1wire_SN(21, 0)
+    # a bad serial number is not cached
+    assert (21, 0) not in fake_arx._onewire_sn
+
+
+def test_get_board_info_queries_board(fake_arx, fake_store):
+    assert fake_arx.get_board_info(17)['sw_ver'] == 258
+    conftest.BOARD_REPLIES['arxn']['sw_ver'] = 259
+    try:
+        # a reflashed board is seen on the next call
+        assert fake_arx.get_board_info(17)['sw_ver'] == 259
+    finally:
+        conftest.BOARD_REPLIES['arxn']['sw_ver'] = 258
+    assert count(fake_store, 17, 'arxn') == 2
+
+    # dependents reuse the refreshed info
+    assert fake_arx.get_firmware_version(17) == 259
+    assert fake_arx.get_board_sn(17) == 7
+    fake_arx.get_all_chan_current(17)
+    assert count(fake_store, 17, 'arxn') == 2
+
+
+def test_board_info_dependents_query_once(fake_arx, fake_store):
+    fake_arx.get_board_sn(17)
+    fake_arx.get_firmware_version(17)
+    fake_arx.get_chan_current(17, 3)
+    assert count(fake_store, 17, 'arxn') == 1
+    fake_arx.refresh_board_info(17)
+    fake_arx.get_board_sn(17)
+    assert count(fake_store, 17, 'arxn') == 2
+
+
+def test_set_time_all_same_payload(fake_arx, fake_store):
+    assert fake_arx.set_time_all(1700000000, [17, 21, 45]) == ""
+    assert fake_store.cmds('/cmd/arx/') == [
+        ('/cmd/arx/{}'.format(arx_addr), 'stim', '6553F100')
+        for arx_addr in [17, 21, 45]]
+
+
+@pytest.mark.parametrize("time0,time_str", [
+    (0, '00000000'), (1, '00000001'), (0xFFFFFFFF, 'FFFFFFFF')])
+def test_set_time_sends_8_hex_digits(fake_arx, fake_store, time0, time_str):
+    fake_arx._set_time(17, time0)
+    assert last_cmd(fake_store) == ('stim', time_str)
+
+
+@pytest.mark.parametrize("time0", [-1, 0x100000000])
+def test_set_time_out_of_range(fake_arx, fake_store, time0):
+    with pytest.raises(arxe.ArxException):
+        fake_arx._set_time(17, time0)
+    with pytest.raises(arxe.ArxException):
+        fake_arx.set_time_all(time0, [17])
+    assert fake_store.cmds('/cmd/arx/') == []
+
+
+def test_set_time_all_collects_errors(fake_arx, fake_store):
+    def responder(key, cmd_dict):
+        if key == '/cmd/arx/21':
+            return NAK_REPLY
+        return conftest.board_responder(key, cmd_dict)
+
+    fake_store.responder = responder
+    with pytest.raises(arxe.ArxException) as exc:
+        fake_arx.set_time_all(1700000000, [17, 21])
+    assert '21: ' in str(exc.value)
+    assert '17: ' not in str(exc.value)
+    # the time is checked before anything is sent
+    with pytest.raises(arxe.ArxException):
+        fake_arx.set_time_all(-1, [17])
+    assert len(fake_store.cmds('/cmd/arx/')) == 2
+
+
+def test_refresh_board_info_forgets_1wire(fake_store):
+    my_arx = arx.ARX(cache_ttl=60)
+    my_arx.get_1wire_count(17)
+    my_arx.get_1wire_SN(17, 0)
+    my_arx.refresh_board_info(17)
+    my_arx.get_1wire_count(17)
+    my_arx.get_1wire_SN(17, 0)
+    assert count(fake_store, 17, 'owdc') == 2
+    assert count(fake_store, 17, 'owsn') == 2
+
+
+def test_read_during_write_not_cached(fake_store):
+    my_arx = arx.ARX(cache_ttl=60)
+
+    def responder(key, cmd_dict):
+        if cmd_dict['cmd'] == 'seta':
+            # a read sent while the write is in flight, answered before
+            # the board applied the write
+            my_arx.get_all_chan_cfg(17)
+        return conftest.board_responder(key, cmd_dict)
+
+    fake_store.responder = responder
+    my_arx.set_all_chan_cfg(17, CFG)
+    assert count(fake_store, 17, 'geta') == 1
+    my_arx.get_all_chan_cfg(17)
+    assert count(fake_store, 17, 'geta') == 2
+
+
+@pytest.mark.parametrize("write", [
+    lambda my_arx: my_arx._send_all([17, 21], 'seta', '0000'),
+    lambda my_arx: my_arx._send_batch(17, [('setc', '00000'),
+                                           ('setc', '10000')]),
+])
+def test_read_during_batch_write_not_cached(fake_store, write):
+    my_arx = arx.ARX(cache_ttl=60)
+
+    def responder(key, cmd_dict):
+        if cmd_dict['cmd'] in ('seta', 'setc'):
+            my_arx.get_all_chan_cfg(17)
+        return conftest.board_responder(key, cmd_dict)
+
+    fake_store.responder = responder
+    write(my_arx)
+    reads = count(fake_store, 17, 'geta')
+    my_arx.get_all_chan_cfg(17)
+    assert count(fake_store, 17, 'geta') == reads + 1
+
+
+def test_flush_some_channels_uses_setc(fake_arx, fake_store):
+    fake_arx._set_chan_cfg_first_atten(2, 0)
+    fake_arx._set_chan_cfg_first_atten(5, 63)
+    fake_arx._set_chan_cfg_first_atten(9, 1)
+    assert fake_arx.flush_chan_cfg(17) == ""
+    # untouched channels are not written
+    assert fake_store.cmds('/cmd/arx/') == [
+        ('/cmd/arx/17', 'setc', '{:X}{:04X}'.format(chan, word))
+        for chan, word in [(2, 63 << 3), (5, 0), (9, 62 << 3)]]
+    assert fake_arx._dirty == set()
+
+
+def test_flush_keeps_failed_channels_dirty(fake_arx, fake_store):
+    def responder(key, cmd_dict):
+        if cmd_dict['val']['val'].startswith('5'):
+            return NAK_REPLY
+        return conftest.board_responder(key, cmd_dict)
+
+    fake_store.responder = responder
+    for chan in (2, 5, 9):
+        fake_arx._set_chan_cfg_first_atten(chan, 0)
+    with pytest.raises(arxe.ArxException):
+        fake_arx.flush_chan_cfg(17)
+    assert fake_arx._dirty == {5}
+
+
+def test_get_board_info_bypasses_cache(fake_store):
+    my_arx = arx.ARX(cache_ttl=60)
+    my_arx.get_all_chan_cfg(17)
+    my_arx.get_board_info(17)
+    my_arx.get_board_info(17)
+    assert count(fake_store, 17, 'arxn') == 2
+    # other cached replies are kept
+    my_arx.get_all_chan_cfg(17)
+    assert count(fake_store, 17, 'geta') == 1
+
+
+def test_set_chan_cfg_many(fake_arx, fake_store):
+    word = fake_arx._encode_cfg(CFG)
+    fake_arx.set_chan_cfg_many([(17, 1, CFG), (21, 2, CFG), (17, 3, CFG)])
+    assert fake_store.cmds('/cmd/arx/') == [
+        ('/cmd/arx/{}'.format(arx_addr), 'setc',
+         '{:X}{:04X}'.format(chan, word))
+        for arx_addr, chan in [(17, 1), (21, 2), (17, 3)]]
+    # one batch, all on the shared response key
+    assert all(d['respkey'].startswith(arx.ALL_RESP_KEY)
+               for _, d in fake_store.puts if 'respkey' in d)
+    assert fake_arx._dirty == set()
+
+
+def test_set_chan_cfg_many_reports_every_error(fake_arx, fake_store):
+    def responder(key, cmd_dict):
+        if key == '/cmd/arx/45':
+            return None
+        if key == '/cmd/arx/21':
+            return NAK_REPLY
+        return conftest.board_responder(key, cmd_dict)
+
+    fake_store.responder = responder
+    with pytest.raises(arxe.ArxException) as exc:
+        fake_arx.set_chan_cfg_many([(21, 1, CFG), (17, 2, CFG),
+                                    (45, 3, CFG), (21, 4, CFG)], 0.2)
+    msg = str(exc.value)
+    assert msg.count('21 setc') == 2
+    assert '45 setc' in msg and 'no response' in msg
+    assert '17 setc' not in msg
+    assert len(fake_store.cmds('/cmd/arx/')) == 4
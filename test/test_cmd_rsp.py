@@ -0,0 +1,238 @@
+"""Test code for cmd_rsp.py
+   execute 'pytest' to run tests. No etcd server is needed.
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+
+import lwautils.cmd_rsp as cr
+import lwautils.ServiceNoResponseException as snre
+from conftest import FakeStore
+
+RESP_KEY = '/resp/test/1'
+CMD_KEY = '/cmd/test/1'
+TIMEOUT = 0.2
+
+
+def echo_responder(key, cmd_dict):
+    return {'echo': cmd_dict['val']['val']}
+
+
+def silent_responder(key, cmd_dict):
+    return None
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = FakeStore(echo_responder)
+    monkeypatch.setattr(cr, '_STORE', store)
+    return store
+
+
+@pytest.fixture
+def my_cr(store):
+    my_cr = cr.CmdRsp('LWA')
+    my_cr.set_response_key(RESP_KEY)
+    yield my_cr
+    my_cr.close()
+
+
+def test_send_returns_response_and_deletes_key(store, my_cr):
+    rtn = my_cr.send(CMD_KEY, 'echo', 'abc', TIMEOUT)
+    assert rtn['echo'] == 'abc'
+    resp_key = store.puts[0][1]['respkey']
+    assert resp_key.startswith(RESP_KEY + '-')
+    assert resp_key not in store.data
+    assert my_cr._pending == {}
+
+
+def test_concurrent_sends_get_their_own_response(store, my_cr):
+    # responses arrive out of order from other threads
+    store.delay = lambda: random.uniform(0, 0.02)
+    rtns = {}
+
+    def send(i):
+        rtns[i] = my_cr.send(CMD_KEY, 'echo', i, 1.0)['echo']
+
+    threads = [threading.Thread(target=send, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert rtns == {i: str(i) for i in range(20)}
+    assert my_cr._pending == {}
+
+
+def test_send_many_keeps_request_order(store, my_cr):
+    store.delay = lambda: random.uniform(0, 0.02)
+    rtns = my_cr.send_many([(CMD_KEY, 'echo', i) for i in range(10)], 1.0)
+    assert [rtn['echo'] for rtn in rtns] == [str(i) for i in range(10)]
+
+
+def test_timeout_raises(store, my_cr):
+    store.responder = silent_responder
+    with pytest.raises(snre.ServiceNoResponseException):
+        my_cr.send(CMD_KEY, 'echo', 'abc', TIMEOUT)
+
+
+def test_rset_timeout_returns_none(store, my_cr):
+    store.responder = silent_responder
+    assert my_cr.send(CMD_KEY, 'rset', '', TIMEOUT) is None
+
+
+def test_late_response_after_abandon_deletes_key(store, my_cr):
+    store.responder = silent_responder
+    with pytest.raises(snre.ServiceNoResponseException):
+        my_cr.send(CMD_KEY, 'echo', 'abc', TIMEOUT)
+    cmd_d = store.puts[-1][1]
+    assert cmd_d['id'] in my_cr._pending
+
+    store.write(cmd_d['respkey'], {'id': cmd_d['id'], 'echo': 'abc'})
+    assert cmd_d['respkey'] not in store.data
+    assert cmd_d['respkey'] in store.deletes
+    assert cmd_d['id'] not in my_cr._pending
+
+
+def test_max_abandoned_eviction(store, my_cr, monkeypatch):
+    monkeypatch.setattr(cr, 'MAX_ABANDONED', 3)
+    store.responder = silent_responder
+    cmd_ids = [my_cr.send_nowait(CMD_KEY, 'echo', i) for i in range(5)]
+    assert list(my_cr._abandoned) == cmd_ids[2:]
+    assert set(my_cr._pending) == set(cmd_ids[2:])
+
+    # an evicted command's late response is left alone
+    cmd_d = store.puts[0][1]
+    store.write(cmd_d['respkey'], {'id': cmd_d['id']})
+    assert cmd_d['respkey'] in store.data
+    # a tracked one is still cleaned up
+    cmd_d = store.puts[4][1]
+    store.write(cmd_d['respkey'], {'id': cmd_d['id']})
+    assert cmd_d['respkey'] not in store.data
+
+
+@pytest.mark.parametrize("event", [
+    ['/resp/test/1-x', None],
+    ['/resp/test/1-x', ''],
+    ['/resp/test/1-x', 'not a dict'],
+    ['/resp/test/1-x', {}],
+    ['/resp/test/1-x', {'id': 'unknown'}],
+    ['/resp/test/1-y', {'id': 'x'}],
+    ['/resp/test/1-x'],
+    [None, {'id': 'x'}],
+    None,
+])
+def test_unexpected_event_ignored(my_cr, event):
+    called = []
+    my_cr._add_pending('x', called.append)
+    my_cr._dispatch_callback(event)
+    assert called == []
+
+
+def test_send_async_resolves_on_loop(store, my_cr, monkeypatch):
+    # responses are written from timer threads
+    store.delay = lambda: random.uniform(0, 0.02)
+    set_result = cr._set_future_result
+    resolved_in = []
+
+    def record_set_result(fut, resp_d):
+        resolved_in.append(threading.current_thread())
+        set_result(fut, resp_d)
+
+    monkeypatch.setattr(cr, '_set_future_result', record_set_result)
+
+    async def main():
+        return await asyncio.gather(
+            *(my_cr.send_async(CMD_KEY, 'echo', i, 1.0) for i in range(10)))
+
+    rtns = asyncio.run(main())
+    assert [rtn['echo'] for rtn in rtns] == [str(i) for i in range(10)]
+    assert resolved_in == [threading.main_thread()] * 10
+    assert my_cr._pending == {}
+    assert not any(key.startswith(RESP_KEY + '-') for key in store.data)
+
+
+def test_send_async_timeout_raises(store, my_cr):
+    store.responder = silent_responder
+    with pytest.raises(snre.ServiceNoResponseException):
+        asyncio.run(my_cr.send_async(CMD_KEY, 'echo', 'abc', TIMEOUT))
+
+
+def test_delete_events_ignored(store, my_cr):
+    # every send is followed by a delete event on the watched prefix
+    for i in range(3):
+        assert my_cr.send(CMD_KEY, 'echo', i, TIMEOUT)['echo'] == str(i)
+    assert len(store.deletes) == 3
+
+    # deletes of a key that is still waited on, or of other processes'
+    # keys, do not resolve the command
+    store.delay = 0.05
+    rtn = {}
+    thread = threading.Thread(
+        target=lambda: rtn.update(my_cr.send(CMD_KEY, 'echo', 'abc', 1.0)))
+    thread.start()
+    for _ in range(1000):
+        if my_cr._pending:
+            break
+        time.sleep(0.001)
+    cmd_id = next(iter(my_cr._pending))
+    store.delete(RESP_KEY + '-' + cmd_id)
+    store.delete(RESP_KEY + '0-' + cmd_id)
+    store.delete(RESP_KEY)
+    thread.join()
+    assert rtn['echo'] == 'abc'
+
+
+def written_not_delivered(store):
+    """Responder writing its response to the store but not to watches."""
+    def responder(key, cmd_dict):
+        store.data[cmd_dict['respkey']] = {'id': cmd_dict['id'],
+                                           'echo': 'late'}
+        return None
+    return responder
+
+
+def test_timeout_reads_undelivered_response(store, my_cr):
+    store.responder = written_not_delivered(store)
+    assert my_cr.send(CMD_KEY, 'echo', 'abc', TIMEOUT)['echo'] == 'late'
+    resp_key = store.puts[-1][1]['respkey']
+    assert store.gets == [resp_key]
+    assert resp_key not in store.data
+    assert my_cr._pending == {}
+
+
+def test_timeout_async_reads_undelivered_response(store, my_cr):
+    store.responder = written_not_delivered(store)
+    rtn = asyncio.run(my_cr.send_async(CMD_KEY, 'echo', 'abc', TIMEOUT))
+    assert rtn['echo'] == 'late'
+    assert my_cr._pending == {}
+
+
+def test_rset_timeout_does_not_read(store, my_cr):
+    store.responder = silent_responder
+    my_cr.send(CMD_KEY, 'rset', '', TIMEOUT)
+    assert store.gets == []
+
+
+def test_response_read_only_on_timeout(store, my_cr):
+    my_cr.send(CMD_KEY, 'echo', 'abc', TIMEOUT)
+    assert store.gets == []
+
+
+def test_send_nowait_resp_key(store):
+    # like ARX's shared CmdRsp, no response key is ever set
+    shared_cr = cr.CmdRsp('LWA')
+    try:
+        cmd_id = shared_cr.send_nowait(CMD_KEY, 'echo', 'abc',
+                                       resp_key=RESP_KEY)
+        cmd_d = store.puts[-1][1]
+        assert cmd_d['id'] == cmd_id
+        assert cmd_d['respkey'] == RESP_KEY + '-' + cmd_id
+        # the response is deleted when it arrives
+        assert cmd_d['respkey'] in store.deletes
+        assert shared_cr._pending == {}
+    finally:
+        shared_cr.close()